@@ -0,0 +1,82 @@
+"""Memory per cached capsule, as plain dicts versus records.
+
+    python benchmarks/capsule_memory.py --capsules 2000
+
+Composes capsules for random dates from canned day events (no network). It
+measures with tracemalloc how much memory the kept capsules take in three
+forms: the nested dicts capsules used to be, freshly built records, and
+records read back through pickle the way the disk tier of CapsuleCache
+returns them.
+"""
+import argparse
+import calendar
+import gc
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from capsule import CapsuleBuilder
+
+# Single allocations at least this big are hash table resizes (mostly the
+# interpreter's table of interned strings), which land on whichever phase
+# happens to trigger them rather than on the capsules
+TABLE_RESIZE = 64 * 2**10
+
+
+def fake_day_events(month, day):
+    """A freshly parsed day page: new string objects on every call, like a real fetch"""
+    return {year: [f"Something happened on {calendar.month_name[month]} {day}, {year}."]
+            for year in range(1950, 2025)}
+
+
+def random_dates(count, seed):
+    rng = random.Random(seed)
+    dates = []
+    for _ in range(count):
+        year = rng.randint(1950, 2024)
+        month = rng.randint(1, 12)
+        dates.append(datetime(year, month, rng.randint(1, calendar.monthrange(year, month)[1])))
+    return dates
+
+
+def measure(build):
+    """Bytes still allocated by whatever `build()` returns"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size = sum(trace.size for trace in tracemalloc.take_snapshot().traces if trace.size < TABLE_RESIZE)
+    tracemalloc.stop()
+    return kept, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capsules", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    builder = CapsuleBuilder()
+    dates = random_dates(args.capsules, args.seed)
+
+    def compose(date):
+        return builder.compose(date, fake_day_events(date.month, date.day), None)
+
+    _, dict_bytes = measure(lambda: [compose(date).to_dict() for date in dates])
+    records, record_bytes = measure(lambda: [compose(date) for date in dates])
+    blobs = [pickle.dumps(capsule, protocol=pickle.HIGHEST_PROTOCOL) for capsule in records]
+    del records
+    _, loaded_bytes = measure(lambda: [pickle.loads(blob) for blob in blobs])
+
+    for label, size in (("dicts", dict_bytes), ("records", record_bytes), ("records from disk", loaded_bytes)):
+        print(f"{label:>18}: {size / len(dates) / 1024:7.2f} KB per capsule")
+    print(f"{'pickled':>18}: {sum(map(len, blobs)) / len(blobs) / 1024:7.2f} KB per capsule")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Memory-leak regression harness for repeated time travel.
+
+Runs many `time_travel` cycles over random dates against canned provider data
+(no network) and tracks RSS, tracemalloc, Tk widget/image/font counts and
+live threads. Exits with status 1 if anything grows past its threshold after
+the warm-up cycles. Needs a display; on a headless machine run it under Xvfb:
+
+    xvfb-run python benchmarks/leak_harness.py --cycles 2000
+"""
+import argparse
+import calendar
+import gc
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from tkinter import font
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import providers
+from capsule_cache import CapsuleCache
+from main import RetroDay, ThemedTk
+from search_index import EventIndex
+from warmup import ViewStats
+
+
+def fake_wikipedia_day(month_name, day):
+    lines = [f"{year} – Something happened on {month_name} {day}, {year}." for year in range(1950, 2025)]
+    return "== Events ==\n" + "\n".join(lines)
+
+
+def fake_tmdb_movies(api_key, year, limit=5):
+    return [{"title": f"Movie {i} of {year}", "year": year, "id": year * 10 + i, "poster_url": None}
+            for i in range(limit)]
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is not available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def sample(root):
+    gc.collect()
+    return {
+        "rss_mb": rss_mb(),
+        "py_mb": tracemalloc.get_traced_memory()[0] / 2**20,
+        "widgets": count_widgets(root),
+        "images": len(root.tk.call("image", "names")),
+        "fonts": len(font.names(root)),
+        "threads": threading.active_count(),
+    }
+
+
+def run_cycle(app, root, rng):
+    year = rng.randint(1950, 2024)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, calendar.monthrange(year, month)[1])
+    app.month_var.set(calendar.month_name[month])
+    app.day_var.set(str(day))
+    app.year_var.set(str(year))
+
+    threads_before = threading.active_count()
+    app.time_travel()
+    # Pump the event loop until the worker is done and its render pass has run
+    while threading.active_count() > threads_before or app.render.pending or app.render.flush_scheduled:
+        root.update()
+        time.sleep(0.001)
+    root.update()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50, help="cycles to run before taking the baseline")
+    parser.add_argument("--every", type=int, default=100, help="print a sample every N cycles")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rss-growth", type=float, default=20.0, help="MB")
+    parser.add_argument("--max-py-growth", type=float, default=5.0, help="MB")
+    parser.add_argument("--max-count-growth", type=int, default=0,
+                        help="allowed growth in widget, image, font and thread counts")
+    args = parser.parse_args()
+
+    providers.fetch_wikipedia_day = fake_wikipedia_day
+    providers.fetch_tmdb_movies = fake_tmdb_movies
+
+    rng = random.Random(args.seed)
+    root = ThemedTk(theme="equilux")
+    app = RetroDay(root)
+    app.capsules.bundle = None
+    app.capsules.tmdb_api_key = "fake"
+    # Keep the fake events, capsules and view counts out of the real cache/
+    scratch = tempfile.mkdtemp(prefix="retroday-leak-")
+    app.search_index = app.capsules.search_index = EventIndex(os.path.join(scratch, "events.db"))
+    # A small memory tier fills up during warm-up, so a full LRU doesn't read as a leak
+    app.capsules.cache = CapsuleCache(os.path.join(scratch, "capsules"), max_bytes=256 * 2**10)
+    app.views = app.poster_warmer.views = ViewStats(os.path.join(scratch, "views.json"))
+
+    for _ in range(args.warmup):
+        run_cycle(app, root, rng)
+
+    tracemalloc.start(25)
+    baseline = sample(root)
+    snapshot = tracemalloc.take_snapshot()
+    print(f"baseline: {baseline}")
+
+    for cycle in range(1, args.cycles + 1):
+        run_cycle(app, root, rng)
+        if cycle % args.every == 0:
+            print(f"cycle {cycle}: {sample(root)}")
+
+    final = sample(root)
+    growth = {key: final[key] - baseline[key] for key in baseline}
+    limits = {
+        "rss_mb": args.max_rss_growth,
+        "py_mb": args.max_py_growth,
+        "widgets": args.max_count_growth,
+        "images": args.max_count_growth,
+        "fonts": args.max_count_growth,
+        "threads": args.max_count_growth,
+    }
+    failures = [f"{key} grew by {growth[key]:.2f} (limit {limits[key]})"
+                for key in limits if growth[key] > limits[key]]
+
+    print(f"final: {final}")
+    if failures:
+        print("LEAK DETECTED:\n  " + "\n  ".join(failures))
+        print("Top allocation growth since baseline:")
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "traceback")[:10]:
+            print(f"  {stat}")
+            for line in stat.traceback.format()[-4:]:
+                print(f"    {line}")
+        root.destroy()
+        shutil.rmtree(scratch, ignore_errors=True)
+        sys.exit(1)
+
+    print(f"OK: no growth beyond thresholds over {args.cycles} cycles")
+    root.destroy()
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
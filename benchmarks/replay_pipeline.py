@@ -0,0 +1,105 @@
+"""Reproducible benchmark of the data pipeline over recorded HTTP fixtures.
+
+Record fixtures once on a machine with network access (and api_keys.json):
+
+    python benchmarks/replay_pipeline.py --record --dates 20
+
+then replay them anywhere, offline, with a simulated network:
+
+    python benchmarks/replay_pipeline.py --dates 20 --latency-ms 80 --bandwidth-kbps 512 --error-rate 0.05
+
+The real CapsuleBuilder.collect and poster download code paths run on top of
+net.ReplayTransport, so results only depend on the fixtures and the seed.
+"""
+import argparse
+import calendar
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import net
+from bundle import load_tmdb_key
+from capsule import CapsuleBuilder
+from downloads import download_to_cache
+from profiling import SamplingProfiler
+
+
+def random_dates(count, seed):
+    rng = random.Random(seed)
+    dates = []
+    for _ in range(count):
+        year = rng.randint(1950, 2024)
+        month = rng.randint(1, 12)
+        dates.append(datetime(year, month, rng.randint(1, calendar.monthrange(year, month)[1])))
+    return dates
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default="fixtures")
+    parser.add_argument("--record", action="store_true", help="hit the live services and record fixtures")
+    parser.add_argument("--dates", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--profile", action="store_true", help="sample the run and write a profile to profiles/")
+    args = parser.parse_args()
+
+    store = net.FixtureStore(args.fixtures)
+    if args.record:
+        net.set_transport(net.RecordingTransport(store))
+    else:
+        net.set_transport(net.ReplayTransport(
+            store,
+            latency=args.latency_ms / 1000,
+            bandwidth=args.bandwidth_kbps * 1024 or None,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ))
+
+    # api_key is stripped from fixture keys, so any key replays the recorded TMDB responses
+    tmdb_key = load_tmdb_key()
+    if not tmdb_key and not args.record:
+        tmdb_key = "replay"
+    builder = CapsuleBuilder(tmdb_api_key=tmdb_key)
+    image_dir = tempfile.mkdtemp(prefix="retroday-bench-")
+    timings = []
+    profiler = SamplingProfiler().start() if args.profile else None
+    try:
+        for date in random_dates(args.dates, args.seed):
+            net.reset()
+            start = time.perf_counter()
+            capsule = builder.collect(date)
+            for movie in capsule.movies:
+                if movie.poster_url:
+                    download_to_cache(movie.poster_url, os.path.join(image_dir, f"movie_{movie.id}.jpg"))
+            timings.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(image_dir, ignore_errors=True)
+        if profiler is not None:
+            profiler.stop()
+
+    ms = [t * 1000 for t in timings]
+    print(f"{len(ms)} capsules: mean {statistics.mean(ms):.1f} ms, "
+          f"p50 {percentile(ms, 0.5):.1f} ms, p95 {percentile(ms, 0.95):.1f} ms, max {max(ms):.1f} ms")
+    for host, stats in net.limiter_stats().items():
+        print(f"  {host}: {stats}")
+    if profiler is not None:
+        print(f"Profile written to {profiler.write(f'replay-{datetime.now():%Y%m%d-%H%M%S}')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the cost of switching decade themes as the number of widgets grows.
+
+Compares the old `tk_setPalette` approach with DecadeThemes. Needs a display;
+on a headless machine run it under Xvfb:
+
+    xvfb-run python benchmarks/theme_switch.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from themes import DecadeThemes
+
+DECADE_COLORS = {
+    "1960s": {"bg": "#FF6B6B", "accent": "#4ECDC4", "text": "#000000"},
+    "1990s": {"bg": "#6A0DAD", "accent": "#00FF00", "text": "#FFFFFF"},
+}
+WIDGET_COUNTS = (100, 500, 1000, 2000, 5000)
+ROUNDS = 10
+
+
+def populate(frame, count):
+    for widget in frame.winfo_children():
+        widget.destroy()
+    for i in range(count):
+        if i % 2:
+            tk.Label(frame, text=f"Label {i}").pack()
+        else:
+            ttk.Label(frame, text=f"Label {i}").pack()
+    frame.update_idletasks()
+
+
+def time_switches(root, switch):
+    names = list(DECADE_COLORS)
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        switch(names[i % len(names)])
+        root.update_idletasks()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    root = tk.Tk()
+    frame = ttk.Frame(root)
+    frame.pack()
+    themes = DecadeThemes(root, DECADE_COLORS)
+
+    def set_palette(name):
+        colors = DECADE_COLORS[name]
+        root.tk_setPalette(background=colors["bg"], foreground=colors["text"],
+                           activeBackground=colors["accent"], activeForeground="#FFFFFF")
+
+    print(f"{'widgets':>8} {'tk_setPalette ms':>18} {'DecadeThemes ms':>16}")
+    for count in WIDGET_COUNTS:
+        populate(frame, count)
+        palette_ms = time_switches(root, set_palette)
+        themes_ms = time_switches(root, themes.apply)
+        print(f"{count:>8} {palette_ms:>18.2f} {themes_ms:>16.2f}")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
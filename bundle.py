@@ -0,0 +1,189 @@
+"""Offline bundle of historical events and TMDB movies.
+
+Build it once on a machine with a good connection:
+
+    python bundle.py build --out retroday.bundle
+
+RetroDay opens ``retroday.bundle`` read-only (memory-mapped) when it exists and
+answers lookups from it without touching the network.
+
+File layout: an 8 byte magic, a little-endian uint32 format version and a
+uint32 index length, then the JSON index followed by the JSON payloads. The
+index maps "MM-DD" day keys and TMDB years to (offset, length) pairs into the
+payload area, so a lookup only decodes the record it needs.
+"""
+import argparse
+import calendar
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import net
+import providers
+
+MAGIC = b"RDBUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+DEFAULT_PATH = "retroday.bundle"
+FIRST_YEAR = 1950
+
+
+class EventBundle:
+    """Read-only, memory-mapped view of a bundle file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a RetroDay bundle")
+            if version != VERSION:
+                raise ValueError(f"{path} has bundle version {version}, expected {VERSION}")
+            index_start = HEADER.size
+            self._data_start = index_start + index_length
+            self.index = json.loads(self._map[index_start:self._data_start].decode("utf-8"))
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def open_if_exists(cls, path=DEFAULT_PATH):
+        """Open the bundle at `path`, or return None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except Exception as e:
+            print(f"Error opening bundle: {e}")
+            return None
+
+    def _read(self, section, key):
+        entry = self.index[section].get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_start + offset
+        return json.loads(self._map[start:start + length].decode("utf-8"))
+
+    def events_for_day(self, month, day):
+        """Return {year: [events]} for a day, or None if the day is not bundled"""
+        events = self._read("days", f"{month:02d}-{day:02d}")
+        if events is None:
+            return None
+        return {int(year): items for year, items in events.items()}
+
+    def movies_for_year(self, year):
+        """Return the bundled TMDB movie dicts for a year, or None"""
+        return self._read("movies", str(year))
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def fetch_day(month, day):
+    """Fetch and index the events for one day, falling back to onthisday.com"""
+    return providers.fetch_day_events(calendar.month_name[month], day)
+
+
+def all_days():
+    """Every (month, day) pair of a leap year, so February 29 is included"""
+    return [(month, day)
+            for month in range(1, 13)
+            for day in range(1, calendar.monthrange(2000, month)[1] + 1)]
+
+
+def build_bundle(path, tmdb_api_key="", workers=8, first_year=FIRST_YEAR, last_year=None, retries=2):
+    """Crawl every day page and TMDB year and write them into a bundle at `path`
+
+    Requests are paced by the per-host limiters in net, so `workers` only
+    bounds how many fetches are queued at once. Failed entries are retried
+    up to `retries` more times; returns the keys that still failed.
+    """
+    last_year = last_year or datetime.now().year
+
+    pending = {}
+    for month, day in all_days():
+        pending[("days", f"{month:02d}-{day:02d}")] = (fetch_day, (month, day))
+    if tmdb_api_key:
+        for year in range(first_year, last_year + 1):
+            pending[("movies", str(year))] = (providers.fetch_tmdb_movies, (tmdb_api_key, year))
+
+    records = {"days": {}, "movies": {}}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for attempt in range(retries + 1):
+            jobs = {pool.submit(func, *args): job for job, (func, args) in pending.items()}
+            failed = {}
+            for future in as_completed(jobs):
+                section, key = jobs[future]
+                try:
+                    records[section][key] = future.result()
+                except Exception as e:
+                    print(f"Error fetching {section} {key}: {e}")
+                    failed[(section, key)] = pending[(section, key)]
+            pending = failed
+            if not pending:
+                break
+
+    write_bundle(path, records)
+    return [key for _, key in pending]
+
+
+def write_bundle(path, records):
+    """Serialize {"days": {...}, "movies": {...}} records into a bundle file"""
+    payload = bytearray()
+    index = {"version": VERSION, "built": datetime.now().isoformat(timespec="seconds")}
+    for section in ("days", "movies"):
+        index[section] = {}
+        for key in sorted(records.get(section, {})):
+            blob = json.dumps(records[section][key], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            index[section][key] = [len(payload), len(blob)]
+            payload.extend(blob)
+
+    index_blob = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(index_blob)))
+        f.write(index_blob)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def load_tmdb_key(path="api_keys.json"):
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("tmdb", "")
+    except Exception:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an offline RetroDay data bundle")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True  # add_subparsers(required=...) needs Python 3.7
+    build = sub.add_parser("build", help="crawl all day pages and TMDB years into a bundle")
+    build.add_argument("--out", default=DEFAULT_PATH, help="bundle file to write")
+    build.add_argument("--workers", type=int, default=8, help="concurrent fetches")
+    build.add_argument("--tmdb-key", default=None, help="TMDB API key (defaults to api_keys.json)")
+    args = parser.parse_args()
+
+    # One timeout must not fail every remaining day as "offline"
+    net.set_fail_fast(False)
+    tmdb_key = args.tmdb_key if args.tmdb_key is not None else load_tmdb_key()
+    if not tmdb_key:
+        print("No TMDB API key found, the bundle will only contain events.")
+    failed = build_bundle(args.out, tmdb_key, workers=args.workers)
+    print(f"Wrote {args.out}" + (f" ({len(failed)} entries failed)" if failed else ""))
+    for host, stats in net.limiter_stats().items():
+        print(f"  {host}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
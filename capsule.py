@@ -0,0 +1,328 @@
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import providers
+from records import Capsule, Event, Fashion, Movie, Music, Song, Technology, shared
+
+# Bump when the contents of composed capsules change, so cached ones are rebuilt
+CAPSULE_VERSION = 3
+
+# Curated fallbacks, built once and shared by every capsule of their decade
+DECADE_EVENTS = {
+    1950: (
+        Event("The post-war economic boom leads to suburban expansion"),
+        Event("Rock 'n' roll music emerges as a cultural force"),
+        Event("The Cold War begins between the US and Soviet Union"),
+    ),
+    1960: (
+        Event("Civil Rights Movement gains momentum"),
+        Event("The Beatles revolutionize popular music"),
+        Event("Humans land on the moon (1969)"),
+    ),
+    # Add more decades as needed
+}
+NO_EVENTS = (Event("No specific historical events found for this date."),)
+
+DECADE_MOVIES = {
+    1950: (
+        Movie("Singin' in the Rain", 1952, "Gene Kelly, Stanley Donen"),
+        Movie("Rear Window", 1954, "Alfred Hitchcock"),
+        Movie("Some Like It Hot", 1959, "Billy Wilder"),
+    ),
+    1960: (
+        Movie("Psycho", 1960, "Alfred Hitchcock"),
+        Movie("The Sound of Music", 1965, "Robert Wise"),
+        Movie("2001: A Space Odyssey", 1968, "Stanley Kubrick"),
+    ),
+    # Add more decades as needed
+}
+
+DECADE_MUSIC = {
+    1950: Music(
+        songs=(
+            Song("Hound Dog", "Elvis Presley"),
+            Song("Johnny B. Goode", "Chuck Berry"),
+            Song("What'd I Say", "Ray Charles"),
+        ),
+        artists=("Elvis Presley", "Chuck Berry", "Little Richard", "Frank Sinatra"),
+        trivia=(
+            "Rock 'n' roll emerged in the mid-1950s, blending rhythm and blues with country music.",
+            "The 45 rpm single became the standard format for hit songs.",
+        ),
+    ),
+    1960: Music(
+        songs=(
+            Song("Hey Jude", "The Beatles"),
+            Song("(I Can't Get No) Satisfaction", "The Rolling Stones"),
+            Song("Respect", "Aretha Franklin"),
+        ),
+        artists=("The Beatles", "The Rolling Stones", "Bob Dylan", "Aretha Franklin"),
+        trivia=(
+            "The British Invasion, led by The Beatles, changed American music in 1964.",
+            "Woodstock Festival in 1969 became a defining moment for 1960s counterculture.",
+        ),
+    ),
+    # Add more decades as needed
+}
+NO_MUSIC = Music(
+    songs=(Song("No specific song data available", "Unknown"),),
+    artists=("No artist data available",),
+    trivia=("No music trivia available for this period.",),
+)
+
+DECADE_TECHNOLOGY = {
+    1950: Technology(
+        gadgets=("Transistor radio", "Black-and-white TV", "Electric typewriter"),
+        milestones=(
+            "First commercial computer (UNIVAC I) released in 1951",
+            "First transistor radio introduced in 1954",
+            "Sputnik 1, the first artificial satellite, launched in 1957",
+        ),
+        computing="Computers were room-sized machines used mainly by governments and large corporations. Programming was done with punch cards.",
+    ),
+    1960: Technology(
+        gadgets=("Portable cassette player", "Color TV", "Electronic calculator"),
+        milestones=(
+            "First video game (Spacewar!) created in 1962",
+            "ARPANET, precursor to the internet, developed in 1969",
+            "First human on the moon in 1969",
+        ),
+        computing="Mainframe computers became more widespread in businesses. The concept of personal computing was still in its infancy.",
+    ),
+    # Add more decades as needed
+}
+NO_TECHNOLOGY = Technology(
+    gadgets=("No specific gadget data available",),
+    milestones=("No specific tech milestones available",),
+    computing="No computing information available for this period.",
+)
+
+DECADE_FASHION = {
+    1950: Fashion(
+        clothing=(
+            "Poodle skirts with sweater sets",
+            "Men's suits with narrow ties",
+            "Pedal pushers and saddle shoes",
+        ),
+        hairstyles=(
+            "Pompadour for men",
+            "Poodle cut for women",
+            "Ducktail hairstyle",
+        ),
+        icons=("Marilyn Monroe", "James Dean", "Audrey Hepburn"),
+    ),
+    1960: Fashion(
+        clothing=(
+            "Mini skirts and go-go boots",
+            "Mod suits with skinny ties",
+            "Tie-dye and psychedelic prints",
+        ),
+        hairstyles=(
+            "Beehive hairdos",
+            "Long, straight hair (hippie style)",
+            "The Beatles mop-top",
+        ),
+        icons=("Twiggy", "The Beatles", "Jacqueline Kennedy"),
+    ),
+    # Add more decades as needed
+}
+NO_FASHION = Fashion(
+    clothing=("No specific clothing data available",),
+    hairstyles=("No specific hairstyle data available",),
+    icons=("No fashion icons available for this period",),
+)
+
+# Capsules read back from the disk cache point at these instances again
+for record in chain(chain.from_iterable(DECADE_EVENTS.values()), NO_EVENTS,
+                    chain.from_iterable(DECADE_MOVIES.values()),
+                    DECADE_MUSIC.values(), DECADE_TECHNOLOGY.values(), DECADE_FASHION.values(),
+                    (NO_MUSIC, NO_TECHNOLOGY, NO_FASHION)):
+    shared(record)
+
+
+class CapsuleBuilder:
+    """Collects the data shown in a time capsule for a date
+
+    Has no UI code, so it can be used from worker threads and from
+    command-line tools (export, bundle) as well as the RetroDay window.
+    """
+
+    def __init__(self, bundle=None, tmdb_api_key="", search_index=None, cache=None):
+        self.bundle = bundle
+        self.tmdb_api_key = tmdb_api_key
+        self.search_index = search_index
+        self.cache = cache
+
+    def collect(self, date):
+        """Gather every category for a date"""
+        capsule = self.cached(date)
+        if capsule is None:
+            capsule = self.assemble(date, self.get_day_events(date.month, date.day), self.get_year_movies(date.year))
+        return capsule
+
+    def cache_key(self, date):
+        # A rebuilt bundle changes the data behind every capsule
+        built = self.bundle.index.get("built", "") if self.bundle else ""
+        # Adding a TMDB key replaces the curated decade movies
+        movies = "tmdb" if self.tmdb_api_key else "curated"
+        return f"{CAPSULE_VERSION}:{built}:{movies}:{date:%Y-%m-%d}"
+
+    def cached(self, date):
+        """Return the cached capsule for a date, or None"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(date))
+
+    def assemble(self, date, day_events, year_movies):
+        """Compose a capsule and cache it, unless it had to fall back because a fetch failed"""
+        capsule = self.compose(date, day_events, year_movies)
+        if self.cache is not None and capsule.complete:
+            self.cache.put(self.cache_key(date), capsule)
+        return capsule
+
+    def collect_many(self, dates, workers=8, fetch_poster=None):
+        """Gather capsules for many dates, fetching each shared upstream key only once
+
+        Cached capsules are reused as they are. For the rest, the distinct
+        day pages and TMDB years are planned up front and fetched concurrently,
+        then every capsule is composed from the shared results. If
+        `fetch_poster` is given it is called once per distinct poster URL with
+        one of the Movie records using it. Returns capsules in `dates` order.
+        """
+        capsules = {date: self.cached(date) for date in dates}
+        missing = [date for date, capsule in capsules.items() if capsule is None]
+        days = sorted({(date.month, date.day) for date in missing})
+        years = sorted({date.year for date in missing})
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            day_jobs = {key: pool.submit(self.get_day_events, *key) for key in days}
+            year_jobs = {year: pool.submit(self.get_year_movies, year) for year in years}
+            day_events = {key: job.result() for key, job in day_jobs.items()}
+            year_movies = {year: job.result() for year, job in year_jobs.items()}
+
+            for date in missing:
+                capsules[date] = self.assemble(date, day_events[(date.month, date.day)], year_movies[date.year])
+
+            if fetch_poster:
+                posters = {}
+                for capsule in capsules.values():
+                    for movie in capsule.movies:
+                        if movie.poster_url:
+                            posters.setdefault(movie.poster_url, movie)
+                list(pool.map(fetch_poster, posters.values()))
+
+        return [capsules[date] for date in dates]
+
+    def compose(self, date, day_events, year_movies):
+        """Build a capsule from already fetched day events and TMDB movies (either may be None)"""
+        decade = (date.year // 10) * 10
+        return Capsule(
+            date=date,
+            decade_style=f"{decade}s",
+            # Every event, so a cached capsule still pages with "Show more"
+            events=tuple(self.iter_events(date, day_events)),
+            movies=year_movies or self.decade_movies(date),
+            music=self.get_music(date),
+            technology=self.get_technology(date),
+            fashion=self.get_fashion(date),
+            complete=day_events is not None and (year_movies is not None or not self.tmdb_api_key),
+        )
+
+    def get_day_events(self, month, day):
+        """Get {year: [events]} for a day from the bundle, Wikipedia or onthisday.com (None if unavailable)
+
+        When the live fetch fails, the copy kept in the search index is used.
+        """
+        try:
+            # Use the offline bundle when the day is in it
+            if self.bundle:
+                bundled = self.bundle.events_for_day(month, day)
+                if bundled:
+                    return bundled
+
+            month_name = calendar.month_name[month]
+            try:
+                by_year = providers.fetch_day_events(month_name, day)
+            except Exception:
+                # Offline or failing upstream: a day fetched before still opens (e.g. from search)
+                indexed = self.search_index.events_for_day(month, day) if self.search_index is not None else None
+                if indexed:
+                    return indexed
+                raise
+
+            self.index_day(month, day, by_year)
+            return by_year
+
+        except Exception as e:
+            print(f"Error getting historical events: {e}")
+            return None
+
+    def index_day(self, month, day, by_year):
+        """Add a freshly fetched day to the search index"""
+        if self.search_index is None:
+            return
+        try:
+            self.search_index.add_day(month, day, by_year)
+        except Exception as e:
+            print(f"Error indexing events: {e}")
+
+    def iter_events(self, date, day_events):
+        """Yield every event for the year (or failing that, its decade), falling back to generic decade events"""
+        year = date.year
+        decade = (year // 10) * 10
+        day_events = day_events or {}
+
+        if day_events.get(year):
+            for event in day_events[year]:
+                yield Event.make(event, year)
+            return
+
+        found = False
+        for y in range(decade, decade + 10):
+            for event in day_events.get(y, []):
+                found = True
+                yield Event.make(event, y)
+        if not found:
+            yield from self.decade_events(date)
+
+    def decade_events(self, date):
+        """Generic events for the decade of the given date"""
+        return DECADE_EVENTS.get((date.year // 10) * 10, NO_EVENTS)
+
+    def get_year_movies(self, year):
+        """Get TMDB's most popular movies for a year from the bundle or TMDB (None if unavailable)"""
+        # Use the offline bundle when the year is in it
+        if self.bundle:
+            bundled = self.bundle.movies_for_year(year)
+            if bundled:
+                return tuple(map(Movie.from_dict, bundled))
+
+        # Try to use TMDB API if available
+        if self.tmdb_api_key:
+            try:
+                return tuple(map(Movie.from_dict, providers.fetch_tmdb_movies(self.tmdb_api_key, year)))
+            except Exception:
+                pass
+        return None
+
+    def decade_movies(self, date):
+        """Curated movies for the decade of the given date"""
+        movies = DECADE_MOVIES.get((date.year // 10) * 10)
+        return movies or (Movie("No specific movie data available", date.year),)
+
+    def get_music(self, date):
+        """Get popular music from around the given date"""
+        # Try to use Last.fm or other music API if available
+        # (Implementation would depend on having API access)
+
+        # Fallback to decade-based music data
+        return DECADE_MUSIC.get((date.year // 10) * 10, NO_MUSIC)
+
+    def get_technology(self, date):
+        """Get technology trends from around the given date"""
+        return DECADE_TECHNOLOGY.get((date.year // 10) * 10, NO_TECHNOLOGY)
+
+    def get_fashion(self, date):
+        """Get fashion trends from around the given date"""
+        return DECADE_FASHION.get((date.year // 10) * 10, NO_FASHION)
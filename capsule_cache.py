@@ -0,0 +1,131 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_DIR = os.path.join("cache", "capsules")
+
+
+class CapsuleCache:
+    """Two-tier cache of assembled capsules: an in-process LRU backed by pickles on disk
+
+    The memory tier is bounded by the pickled size of its entries
+    (`max_bytes`). Disk entries older than `max_age` seconds are ignored so
+    live data is refreshed now and then. Keys should include a data version
+    so old entries are simply never looked up again; `prune` deletes them
+    once they expire and keeps the directory under `max_disk_bytes`, oldest
+    first. Thread-safe.
+    """
+
+    # Puts between two prunes of the disk tier
+    PRUNE_EVERY = 200
+
+    def __init__(self, path=DEFAULT_DIR, max_bytes=16 * 2**20, max_age=7 * 24 * 3600, max_disk_bytes=64 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_disk_bytes = max_disk_bytes
+        self.puts = 0
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+        self.prune()
+
+    def file_for(self, key):
+        return os.path.join(self.path, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".pickle")
+
+    def get(self, key):
+        """Return the cached value for `key`, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        path = self.file_for(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                raise FileNotFoundError(path)
+            with open(path, "rb") as f:
+                blob = f.read()
+            value = pickle.loads(blob)
+        except Exception:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.disk_hits += 1
+            self._remember(key, value, len(blob))
+        return value
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self._remember(key, value, len(blob))
+            self.puts += 1
+            prune = self.puts % self.PRUNE_EVERY == 0
+
+        path = self.file_for(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing capsule cache: {e}")
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete expired disk entries, then the oldest ones until the directory fits `max_disk_bytes`"""
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.path):
+            try:
+                info = entry.stat()
+                if now - info.st_mtime > self.max_age:
+                    os.unlink(entry.path)
+                else:
+                    entries.append((info.st_mtime, info.st_size, entry.path))
+            except OSError:
+                pass
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+    def _remember(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.entries[key] = (value, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
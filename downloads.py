@@ -0,0 +1,122 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import net
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one call whose result they all share"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` that other processes respect too"""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+_flights = SingleFlight()
+
+
+def download_to_cache(url, cache_path, chunk_size=64 * 1024):
+    """Download `url` to `cache_path` unless it is already cached, returning the path or None
+
+    Concurrent calls for the same URL share one download, and other processes
+    wait on a lock file next to the target that is removed again afterwards.
+    The body is streamed into a temporary file that is renamed into place, so
+    readers never see a partial file.
+    """
+    if os.path.exists(cache_path):
+        return cache_path
+    if net.failures.hit(url):
+        return None
+    return _flights.do(url, lambda: _download(url, cache_path, chunk_size))
+
+
+def _download(url, cache_path, chunk_size):
+    lock_path = f"{cache_path}.lock"
+    try:
+        return _download_locked(url, cache_path, chunk_size, lock_path)
+    finally:
+        # Waiters still holding the old lock file re-check cache_path once they get it,
+        # so removing it only risks a duplicate download, never a partial file
+        try:
+            os.unlink(lock_path)
+        except OSError:
+            pass
+
+
+def _download_locked(url, cache_path, chunk_size, lock_path):
+    with file_lock(lock_path):
+        # Another thread or process may have finished it while we waited
+        if os.path.exists(cache_path):
+            return cache_path
+
+        with net.stream(url) as response:
+            if response.status_code != 200:
+                net.failures.add(url)
+                return None
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        return cache_path
@@ -0,0 +1,193 @@
+"""Static-site export of time capsules.
+
+    python export.py --start 1969-01-01 --end 1969-12-31 --out site
+
+Writes site/<year>/<MM-DD>.html and .json for every date in the range, plus
+an index.html. Each day page and TMDB year is fetched once per run and
+shared by every date that needs it. A manifest stores a content hash for
+each page, so later runs only rewrite pages whose day events, TMDB movies or
+curated decade data actually changed. Use an offline bundle (see bundle.py)
+to make rebuilds fast and network-free.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import net
+from bundle import EventBundle, load_tmdb_key
+from capsule import CapsuleBuilder
+
+# Bump when the page layout changes so every page is rebuilt
+EXPORT_VERSION = 1
+
+# Events listed on each page
+EXPORT_EVENTS = 10
+MANIFEST = "manifest.json"
+
+
+def date_range(start, end):
+    days = (end - start).days
+    return [start + timedelta(days=i) for i in range(days + 1)]
+
+
+def capsule_payload(capsule):
+    """JSON-friendly form of a capsule"""
+    payload = capsule.to_dict()
+    payload["events"] = payload["events"][:EXPORT_EVENTS]
+    payload["date"] = capsule.date.strftime("%Y-%m-%d")
+    return payload
+
+
+def content_hash(payload):
+    blob = json.dumps([EXPORT_VERSION, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def page_paths(out_dir, date_key):
+    year, month, day = date_key.split("-")
+    base = os.path.join(out_dir, year, f"{month}-{day}")
+    return f"{base}.html", f"{base}.json"
+
+
+def write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def render_list(title, items):
+    if not items:
+        return ""
+    rows = "".join(f"<li>{html.escape(str(item))}</li>" for item in items)
+    return f"<h3>{html.escape(title)}</h3><ul>{rows}</ul>"
+
+
+def render_html(payload):
+    """Render a capsule payload as a standalone HTML page"""
+    date = datetime.strptime(payload["date"], "%Y-%m-%d")
+    formatted_date = date.strftime("%B %d, %Y")
+    music = payload["music"]
+    tech = payload["technology"]
+    fashion = payload["fashion"]
+
+    movies = []
+    for movie in payload["movies"]:
+        details = [str(movie[key]) for key in ("year", "director") if movie.get(key)]
+        movies.append(f"{movie.get('title', 'Unknown Title')} ({', '.join(details)})" if details
+                      else movie.get('title', 'Unknown Title'))
+
+    sections = [
+        "<h2>Historical Events</h2>" + render_list("On This Day", payload["events"]),
+        "<h2>Movies &amp; TV</h2>" + render_list("Popular Movies", movies),
+        "<h2>Music</h2>"
+        + render_list("Top Songs", [f"{s.get('title', 'Unknown')} - {s.get('artist', 'Unknown Artist')}"
+                                    for s in music.get("songs", [])])
+        + render_list("Popular Artists", music.get("artists", []))
+        + render_list("Music Trivia", music.get("trivia", [])),
+        "<h2>Technology</h2>"
+        + render_list("Popular Gadgets", tech.get("gadgets", []))
+        + render_list("Tech Milestones", tech.get("milestones", []))
+        + render_list("Computing & Internet", [tech["computing"]] if tech.get("computing") else []),
+        "<h2>Fashion &amp; Style</h2>"
+        + render_list("Clothing Trends", fashion.get("clothing", []))
+        + render_list("Popular Hairstyles", fashion.get("hairstyles", []))
+        + render_list("Fashion Icons", fashion.get("icons", [])),
+    ]
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>RetroDay - {formatted_date}</title></head>"
+        f"<body class=\"decade-{payload['decade_style']}\">"
+        f"<h1>Welcome to {formatted_date}!</h1>"
+        + "".join(f"<section>{section}</section>" for section in sections)
+        + "</body></html>\n"
+    )
+
+
+def write_page(out_dir, payload):
+    html_path, json_path = page_paths(out_dir, payload["date"])
+    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+    write_atomic(json_path, json.dumps(payload, ensure_ascii=False, indent=2))
+    write_atomic(html_path, render_html(payload))
+
+
+def write_index(out_dir, date_keys):
+    links = "".join(
+        f"<li><a href=\"{key[:4]}/{key[5:]}.html\">{key}</a></li>" for key in sorted(date_keys)
+    )
+    write_atomic(os.path.join(out_dir, "index.html"),
+                 "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>RetroDay</title></head>"
+                 f"<body><h1>RetroDay Time Capsules</h1><ul>{links}</ul></body></html>\n")
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def export(builder, start, end, out_dir, workers=8):
+    """Export every date from `start` to `end`; returns (pages written, pages unchanged, dates skipped)
+
+    Capsules that fell back to generic decade data because a fetch failed
+    are skipped, so an existing page is never replaced by fallback content.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    dates = date_range(start, end)
+    manifest = load_manifest(out_dir)
+
+    # Each day page and TMDB year is fetched once, no matter how many dates share it
+    capsules = builder.collect_many(dates, workers=workers)
+
+    changed = []
+    skipped = []
+    for capsule in capsules:
+        if not capsule.complete:
+            skipped.append(capsule.date)
+            continue
+        payload = capsule_payload(capsule)
+        digest = content_hash(payload)
+        if manifest.get(payload["date"]) == digest and all(map(os.path.exists, page_paths(out_dir, payload["date"]))):
+            continue
+        changed.append(payload)
+        manifest[payload["date"]] = digest
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda payload: write_page(out_dir, payload), changed))
+
+    if changed or not os.path.exists(os.path.join(out_dir, "index.html")):
+        write_index(out_dir, manifest)
+        write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True))
+    return len(changed), len(dates) - len(changed) - len(skipped), len(skipped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export RetroDay time capsules as a static site")
+    parser.add_argument("--start", required=True, help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="last date, YYYY-MM-DD")
+    parser.add_argument("--out", default="site", help="output directory")
+    parser.add_argument("--workers", type=int, default=8, help="parallel fetch and render workers")
+    parser.add_argument("--bundle", default="retroday.bundle", help="offline bundle to read from, if present")
+    args = parser.parse_args()
+
+    # One timeout must not fail every remaining date as "offline"
+    net.set_fail_fast(False)
+    start = datetime.strptime(args.start, "%Y-%m-%d")
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    builder = CapsuleBuilder(EventBundle.open_if_exists(args.bundle), load_tmdb_key())
+    written, unchanged, skipped = export(builder, start, end, args.out, workers=args.workers)
+    print(f"Wrote {written} pages ({unchanged} unchanged) to {args.out}")
+    if skipped:
+        print(f"Skipped {skipped} dates whose data could not be fetched, run the export again to retry them")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
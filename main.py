@@ -2,8 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox, font
 from ttkthemes import ThemedTk
 from PIL import Image, ImageTk
+import argparse
 import io
-import requests
 from datetime import datetime
 import calendar
 import webbrowser
@@ -11,15 +11,37 @@ import threading
 import random
 import json
 import os
-import wikipedia
-import re
-from bs4 import BeautifulSoup
+import sqlite3
+from itertools import chain, islice
+
+from bundle import EventBundle
+from capsule import CapsuleBuilder
+from capsule_cache import CapsuleCache
+from downloads import download_to_cache
+from rendering import RenderScheduler
+from profiling import SamplingProfiler, enabled as profiling_enabled
+from search_index import EventIndex
+from themes import DecadeThemes
+from warmup import PosterWarmer, ViewStats
+
+# Size of the posters on the Movies tab
+POSTER_SIZE = (150, 225)
+
+# Events shown per page, and rows added per Tk callback while filling a page
+EVENTS_PAGE_SIZE = 10
+EVENT_ROWS_PER_BATCH = 3
 
 class RetroDay:
-    def __init__(self, root):
+    def __init__(self, root, profile=False):
         self.root = root
+        # Sample every time travel and write a profile to profiles/ (--profile or RETRODAY_PROFILE=1)
+        self.profile = profile or profiling_enabled()
         self.root.title("RetroDay - Your Time Capsule")
         self.root.geometry("1000x700")
+        self.render = RenderScheduler(self.root)
+        self.events_generation = 0
+        # Created once and reused, so repeated time travel does not churn Tk fonts
+        self.header_font = font.Font(family="Arial", size=24, weight="bold")
         self.setup_theme()
         self.create_widgets()
         self.setup_api_keys()
@@ -27,6 +49,30 @@ class RetroDay:
         # Create directory for caching images
         if not os.path.exists("cache"):
             os.makedirs("cache")
+        
+        # Offline data bundle built with `python bundle.py build`, if present
+        self.bundle = EventBundle.open_if_exists()
+        
+        # Full-text index of every day we have parsed, for offline search
+        try:
+            self.search_index = EventIndex()
+        except sqlite3.Error as e:
+            # No FTS5 in this SQLite build, or a damaged events.db: run without search
+            print(f"Error opening search index: {e}")
+            self.search_index = None
+            self.search_entry.configure(state="disabled")
+            self.search_button.configure(state="disabled")
+        if self.bundle and self.search_index:
+            threading.Thread(target=self.search_index.add_bundle, args=(self.bundle,), daemon=True).start()
+        
+        # Recently viewed capsules, in memory and on disk
+        self.capsules = CapsuleBuilder(self.bundle, self.tmdb_api_key, self.search_index, CapsuleCache())
+        
+        # Warm the poster cache for the most viewed years once the window is up
+        self.views = ViewStats()
+        self.loading = threading.Event()
+        self.poster_warmer = PosterWarmer(self.capsules, self.views, self.prefetch_poster, busy=self.loading)
+        self.root.after(2000, self.poster_warmer.start)
             
         # Default decade colors
         self.decade_colors = {
@@ -40,6 +86,11 @@ class RetroDay:
             "2020s": {"bg": "#2D3142", "accent": "#EF8354", "text": "#FFFFFF"},  # Dark blue with orange
         }
         
+        # Compile the decade colors into ttk styles once, up front
+        self.themes = DecadeThemes(self.root, self.decade_colors)
+        for canvas in self.canvases:
+            self.themes.add_canvas(canvas)
+        
     def setup_theme(self):
         # Set default theme
         self.root.tk_setPalette(
@@ -103,16 +154,38 @@ class RetroDay:
         )
         self.time_travel_btn.pack(side=tk.LEFT, padx=20)
         
+        # Capsules for a whole family or class at once
+        ttk.Button(
+            self.date_frame,
+            text="Family Timeline",
+            command=self.open_family_timeline
+        ).pack(side=tk.LEFT)
+        
         # Create a loading label
         self.loading_var = tk.StringVar()
         self.loading_label = ttk.Label(self.date_frame, textvariable=self.loading_var)
         self.loading_label.pack(side=tk.LEFT, padx=10)
         
+        # Search box for events across all indexed days
+        self.search_frame = ttk.Frame(self.root, padding=(20, 0))
+        self.search_frame.pack(fill=tk.X)
+        
+        ttk.Label(self.search_frame, text="Search Events:", font=("Helvetica", 12)).pack(side=tk.LEFT, padx=10)
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, width=40)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_entry.bind("<Return>", lambda e: self.search_events())
+        
+        self.search_button = ttk.Button(self.search_frame, text="Search", command=self.search_events)
+        self.search_button.pack(side=tk.LEFT, padx=5)
+        
         # Create a notebook for different categories
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
         # Create tabs for each category
+        self.canvases = []
         self.create_tab("overview", "Era Overview")
         self.create_tab("movies", "Movies & TV")
         self.create_tab("music", "Music")
@@ -125,14 +198,22 @@ class RetroDay:
         tab = ttk.Frame(self.notebook)
         self.notebook.add(tab, text=tab_name)
         
+        canvas, scrollable_frame = self.create_scrollable(tab)
+        self.canvases.append(canvas)
+        
+        # Store the frame reference
+        setattr(self, f"{tab_id}_frame", scrollable_frame)
+    
+    def create_scrollable(self, parent):
+        """Fill `parent` with a vertically scrolling canvas; returns (canvas, frame inside it)"""
         # Create a canvas with scrollbar
-        canvas = tk.Canvas(tab)
-        scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
+        canvas = tk.Canvas(parent)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self.render.invalidate_scrollregion(canvas)
         )
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
@@ -140,9 +221,7 @@ class RetroDay:
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
-        
-        # Store the frame reference
-        setattr(self, f"{tab_id}_frame", scrollable_frame)
+        return canvas, scrollable_frame
     
     def time_travel(self):
         """Collect data for the selected date and update the UI"""
@@ -172,51 +251,236 @@ class RetroDay:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             self.loading_var.set("")
     
+    def search_events(self):
+        """Show indexed events matching the search box and jump to the one picked"""
+        query = self.search_var.get().strip()
+        if not query or self.search_index is None:
+            return
+        
+        matches = self.search_index.search(query, limit=50, min_year=1950)
+        if not matches:
+            messagebox.showinfo("Search", f"No events found for \"{query}\".")
+            return
+        
+        results = tk.Toplevel(self.root)
+        results.title(f"Search: {query}")
+        results.geometry("700x400")
+        
+        listbox = tk.Listbox(results, font=("Arial", 11))
+        scrollbar = ttk.Scrollbar(results, orient="vertical", command=listbox.yview)
+        listbox.configure(yscrollcommand=scrollbar.set)
+        for year, month, day, text in matches:
+            listbox.insert(tk.END, f"{calendar.month_name[month]} {day}, {year}: {text}")
+        listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        def jump(event):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            year, month, day, _ = matches[selection[0]]
+            results.destroy()
+            self.month_var.set(calendar.month_name[month])
+            self.day_var.set(str(day))
+            self.year_var.set(str(year))
+            self.time_travel()
+        
+        listbox.bind("<Double-Button-1>", jump)
+        listbox.bind("<Return>", jump)
+    
     def collect_and_display_data(self, date):
         """Collect data and update UI"""
+        # Sample this worker and the main thread, where the tabs are rendered
+        profiler = None
+        if self.profile:
+            profiler = SamplingProfiler(threads=[threading.get_ident(), threading.main_thread().ident]).start()
+        self.loading.set()
+        self.views.record(date.year)
         try:
-            # Determine the decade for theming
-            decade = (date.year // 10) * 10
-            decade_style = f"{decade}s"
-            
-            # Apply era-specific theme if available
-            if decade_style in self.decade_colors:
-                colors = self.decade_colors[decade_style]
-                self.root.tk_setPalette(
-                    background=colors["bg"],
-                    foreground=colors["text"],
-                    activeBackground=colors["accent"],
-                    activeForeground="#FFFFFF"
-                )
-            
-            # Format date for display
-            formatted_date = date.strftime("%B %d, %Y")
+            # A recently viewed date goes straight to rendering
+            capsule = self.capsules.cached(date)
+            if capsule is not None:
+                self.show_capsule(capsule)
+                return
             
-            # Collect data for each category
-            events_data = self.get_historical_events(date)
-            movies_data = self.get_movies_and_tv(date)
-            music_data = self.get_music(date)
-            tech_data = self.get_technology(date)
-            fashion_data = self.get_fashion(date)
+            # Events first, so they show up while the slower providers are still loading
+            day_events = self.capsules.get_day_events(date.month, date.day)
+            self.show_events(date, self.capsules.iter_events(date, day_events))
             
-            # Update UI on the main thread
-            self.root.after(0, lambda: self.update_overview_tab(date, decade_style, events_data))
-            self.root.after(0, lambda: self.update_events_tab(events_data))
-            self.root.after(0, lambda: self.update_movies_tab(movies_data))
-            self.root.after(0, lambda: self.update_music_tab(music_data))
-            self.root.after(0, lambda: self.update_tech_tab(tech_data))
-            self.root.after(0, lambda: self.update_fashion_tab(fashion_data))
+            # Collect data for the other categories
+            capsule = self.capsules.assemble(date, day_events, self.capsules.get_year_movies(date.year))
+            self.show_capsule(capsule, include_events=False)
             
-            # Clear loading indicator
+        except Exception as e:
+            self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
             self.root.after(0, lambda: self.loading_var.set(""))
+        finally:
+            self.loading.clear()
+            if profiler is not None:
+                # Queued after the tab updates, so the profile covers their render pass too
+                # A key per run, so overlapping time travels don't replace each other's callback
+                self.render.schedule(f"profile-{id(profiler)}", lambda: self.finish_profile(profiler, date))
+    
+    def finish_profile(self, profiler, date):
+        """Stop a time-travel profile and write its flamegraph stacks and summary"""
+        profiler.stop()
+        try:
+            path = profiler.write(f"{date:%Y-%m-%d}-{datetime.now():%H%M%S}")
+            print(f"Profile written to {path}")
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+    
+    def show_events(self, date, events):
+        """Render the first page of an events iterator in the Overview and Events tabs (any thread)
+
+        The rest of `events` is left unconsumed for the "Show more" button.
+        """
+        decade_style = f"{(date.year // 10) * 10}s"
+        first_page = list(islice(events, EVENTS_PAGE_SIZE))
+        
+        self.render.schedule_many([
+            # Apply era-specific theme first so the new widgets pick it up
+            ("theme", lambda: self.themes.apply(decade_style)),
+            ("overview", lambda: self.update_overview_tab(date, decade_style, first_page)),
+            ("events", lambda: self.update_events_tab(first_page, more=events)),
+        ])
+    
+    def show_capsule(self, capsule, include_events=True):
+        """Render a collected capsule in the tabs (safe to call from any thread)"""
+        date = capsule.date
+        decade_style = capsule.decade_style
+        formatted_date = date.strftime("%B %d, %Y")
+        
+        if include_events:
+            self.show_events(date, iter(capsule.events))
+        
+        # Update UI on the main thread, all tabs in a single render pass
+        self.render.schedule_many([
+            ("theme", lambda: self.themes.apply(decade_style)),
+            ("movies", lambda: self.update_movies_tab(capsule.movies)),
+            ("music", lambda: self.update_music_tab(capsule.music)),
+            ("technology", lambda: self.update_tech_tab(capsule.technology)),
+            ("fashion", lambda: self.update_fashion_tab(capsule.fashion)),
+            # Clear loading indicator and update window title
+            ("loading", lambda: self.loading_var.set("")),
+            ("title", lambda: self.root.title(f"RetroDay - {formatted_date}")),
+        ])
+    
+    def open_family_timeline(self):
+        """Ask for a list of dates and build all their capsules in one go"""
+        window = tk.Toplevel(self.root)
+        window.title("RetroDay - Family Timeline")
+        window.geometry("700x500")
+        
+        ttk.Label(
+            window,
+            text="Enter one birth date per line (e.g. 1969-07-20 or July 20, 1969):",
+            font=("Helvetica", 12)
+        ).pack(padx=20, pady=(20, 5), anchor="w")
+        
+        dates_text = tk.Text(window, height=8, width=40, font=("Arial", 12))
+        dates_text.pack(padx=20, fill=tk.X)
+        
+        results_frame = ttk.Frame(window)
+        
+        def build():
+            dates = []
+            for line in dates_text.get("1.0", tk.END).splitlines():
+                if not line.strip():
+                    continue
+                date = self.parse_date(line.strip())
+                if date is None:
+                    messagebox.showerror("Invalid Date", f"Could not read the date \"{line.strip()}\".", parent=window)
+                    return
+                dates.append(date)
+            if not dates:
+                return
             
-            # Update window title
-            self.root.after(0, lambda: self.root.title(f"RetroDay - {formatted_date}"))
-            
+            build_btn.configure(state="disabled")
+            self.loading_var.set(f"Building {len(dates)} time capsules...")
+            threading.Thread(target=self.collect_family_timeline, args=(dates, window, results_frame, build_btn)).start()
+        
+        build_btn = ttk.Button(window, text="Build Timeline", command=build)
+        build_btn.pack(pady=10)
+        results_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+    
+    def parse_date(self, text):
+        for date_format in ("%Y-%m-%d", "%B %d, %Y", "%B %d %Y"):
+            try:
+                return datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+        return None
+    
+    def collect_family_timeline(self, dates, window, results_frame, build_btn):
+        """Collect capsules for every date, sharing fetches between them"""
+        try:
+            capsules = self.capsules.collect_many(dates, fetch_poster=self.prefetch_poster)
+            self.render.schedule_many([
+                ("timeline", lambda: self.show_family_timeline(window, results_frame, capsules)),
+                ("loading", lambda: self.loading_var.set("")),
+            ])
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
             self.root.after(0, lambda: self.loading_var.set(""))
+        finally:
+            self.render.schedule("timeline_button", lambda: build_btn.winfo_exists() and build_btn.configure(state="normal"))
+    
+    def show_family_timeline(self, window, results_frame, capsules):
+        """List one row per capsule, each opening the full capsule in the main tabs"""
+        if not window.winfo_exists():
+            return
+        for widget in results_frame.winfo_children():
+            widget.destroy()
+        
+        _, frame = self.create_scrollable(results_frame)
+        for capsule in sorted(capsules, key=lambda c: c.date):
+            row = ttk.Frame(frame, padding=5)
+            row.pack(fill=tk.X, pady=2)
+            
+            ttk.Button(row, text="Open", command=lambda c=capsule: self.show_capsule(c)).pack(side=tk.LEFT, padx=5)
+            
+            highlight = capsule.events[0] if capsule.events else ""
+            tk.Label(
+                row,
+                text=f"{capsule.date.strftime('%B %d, %Y')} ({capsule.decade_style})\n{highlight}",
+                font=("Arial", 11),
+                wraplength=520,
+                justify="left",
+                anchor="w"
+            ).pack(side=tk.LEFT, fill=tk.X)
+    
+    def prefetch_poster(self, movie):
+        """Download and thumbnail a movie poster ahead of rendering; returns the bytes downloaded"""
+        image_path = os.path.join("cache", f"movie_{movie.id or 'unknown'}.jpg")
+        was_cached = os.path.exists(image_path)
+        try:
+            self.poster_thumbnail(movie)
+        except Exception as e:
+            # A bad poster only costs its own thumbnail, the tab shows it without one
+            print(f"Error preparing poster: {e}")
+        if was_cached or not os.path.exists(image_path):
+            return 0
+        return os.path.getsize(image_path)
+    
+    def poster_thumbnail(self, movie):
+        """Path of the movie's poster resized for the Movies tab, downloading it if needed (None if unavailable)"""
+        filename = f"movie_{movie.id or 'unknown'}"
+        thumb_path = os.path.join("cache", f"{filename}_thumb.jpg")
+        if os.path.exists(thumb_path):
+            return thumb_path
+        
+        image_path = self.download_image(movie.poster_url, filename)
+        if not image_path:
+            return None
         
+        img = Image.open(image_path)
+        img = img.resize(POSTER_SIZE, Image.LANCZOS)
+        tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+        img.convert("RGB").save(tmp_path, "JPEG", quality=90)
+        os.replace(tmp_path, thumb_path)
+        return thumb_path
+    
     def update_overview_tab(self, date, decade_style, events_data):
         """Update the overview tab with general information about the era"""
         # Clear previous content
@@ -227,11 +491,10 @@ class RetroDay:
         decade = (date.year // 10) * 10
         
         # Header
-        header_font = font.Font(family="Arial", size=24, weight="bold")
         header = tk.Label(
             self.overview_frame, 
             text=f"Welcome to {formatted_date}!", 
-            font=header_font
+            font=self.header_font
         )
         header.pack(pady=20)
         
@@ -271,7 +534,7 @@ class RetroDay:
             
             highlight_text = tk.Label(
                 highlight_frame,
-                text=highlight,
+                text=str(highlight),
                 font=("Arial", 12),
                 wraplength=700,
                 justify="center"
@@ -294,11 +557,15 @@ class RetroDay:
         )
         note_label.pack(pady=30)
         
-    def update_events_tab(self, events_data):
-        """Update the events tab with historical events"""
+    def update_events_tab(self, events_data, more=None):
+        """Update the events tab with historical events, a few rows at a time
+
+        `more` is an iterator over further events, paged in by a "Show more" button.
+        """
         # Clear previous content
         for widget in self.events_frame.winfo_children():
             widget.destroy()
+        self.events_generation += 1
         
         # Header
         header = tk.Label(
@@ -318,7 +585,20 @@ class RetroDay:
             return
         
         # Display events
-        for i, event in enumerate(events_data):
+        self.add_event_rows(self.events_generation, iter(events_data), more, first=True)
+    
+    def add_event_rows(self, generation, rows, more, first=False):
+        """Add the next batch of event rows, then give the Tk loop a turn before the rest"""
+        if generation != self.events_generation:
+            return  # A newer time travel has replaced this tab
+        
+        batch = list(islice(rows, EVENT_ROWS_PER_BATCH))
+        for event in batch:
+            # Separate each event from the one before it
+            if not first:
+                ttk.Separator(self.events_frame, orient='horizontal').pack(fill='x', padx=40, pady=5)
+            first = False
+            
             event_frame = ttk.Frame(self.events_frame, padding=10)
             event_frame.pack(pady=5, fill=tk.X, padx=20)
             
@@ -331,10 +611,22 @@ class RetroDay:
                 anchor="w"
             )
             event_text.pack(fill=tk.X)
+        
+        if len(batch) == EVENT_ROWS_PER_BATCH:
+            self.root.after(1, lambda: self.add_event_rows(generation, rows, more))
+            return
+        
+        # Page is done; offer the next one if there is anything left
+        next_event = next(more, None) if more is not None else None
+        if next_event is not None:
+            page = chain([next_event], islice(more, EVENTS_PAGE_SIZE - 1))
             
-            # Add a separator, except after the last item
-            if i < len(events_data) - 1:
-                ttk.Separator(self.events_frame, orient='horizontal').pack(fill='x', padx=40, pady=5)
+            def show_more():
+                more_btn.destroy()
+                self.add_event_rows(generation, page, more)
+            
+            more_btn = ttk.Button(self.events_frame, text="Show more", command=show_more)
+            more_btn.pack(pady=10)
     
     def update_movies_tab(self, movies_data):
         """Update the movies tab with popular films and TV shows"""
@@ -372,19 +664,19 @@ class RetroDay:
             # Movie title
             title_label = tk.Label(
                 movie_frame,
-                text=movie.get("title", "Unknown Title"),
+                text=movie.title,
                 font=("Arial", 12, "bold"),
                 wraplength=200
             )
             title_label.pack()
             
             # Movie details
-            if "year" in movie or "director" in movie:
+            if movie.year or movie.director:
                 details = []
-                if "year" in movie:
-                    details.append(f"Year: {movie['year']}")
-                if "director" in movie:
-                    details.append(f"Director: {movie['director']}")
+                if movie.year:
+                    details.append(f"Year: {movie.year}")
+                if movie.director:
+                    details.append(f"Director: {movie.director}")
                 
                 details_label = tk.Label(
                     movie_frame,
@@ -395,13 +687,11 @@ class RetroDay:
                 details_label.pack(pady=5)
             
             # Movie poster (placeholder)
-            if "poster_url" in movie and movie["poster_url"]:
+            if movie.poster_url:
                 try:
-                    image_path = self.download_image(movie["poster_url"], f"movie_{movie.get('id', 'unknown')}")
-                    if image_path:
-                        img = Image.open(image_path)
-                        img = img.resize((150, 225), Image.LANCZOS)
-                        photo = ImageTk.PhotoImage(img)
+                    thumb_path = self.poster_thumbnail(movie)
+                    if thumb_path:
+                        photo = ImageTk.PhotoImage(Image.open(thumb_path))
                         
                         poster_label = tk.Label(movie_frame, image=photo)
                         poster_label.image = photo  # Keep a reference
@@ -453,13 +743,13 @@ class RetroDay:
         
         # Create lists for songs and artists
         row = 0
-        for song in music_data.get("songs", []):
+        for song in music_data.songs:
             song_frame = ttk.Frame(songs_frame, padding=5)
             song_frame.grid(row=row, column=0, sticky="w", pady=2)
             
             song_text = tk.Label(
                 song_frame,
-                text=f"• {song.get('title', 'Unknown')} - {song.get('artist', 'Unknown Artist')}",
+                text=f"• {song.title} - {song.artist}",
                 font=("Arial", 12),
                 anchor="w"
             )
@@ -468,7 +758,7 @@ class RetroDay:
             row += 1
         
         # Display top artists
-        if "artists" in music_data and music_data["artists"]:
+        if music_data.artists:
             artists_label = tk.Label(
                 self.music_frame,
                 text="Popular Artists",
@@ -480,7 +770,7 @@ class RetroDay:
             artists_frame.pack(pady=10, fill=tk.X, padx=40)
             
             row = 0
-            for artist in music_data["artists"]:
+            for artist in music_data.artists:
                 artist_frame = ttk.Frame(artists_frame, padding=5)
                 artist_frame.grid(row=row, column=0, sticky="w", pady=2)
                 
@@ -495,7 +785,7 @@ class RetroDay:
                 row += 1
         
         # Music trivia or fun fact
-        if "trivia" in music_data and music_data["trivia"]:
+        if music_data.trivia:
             trivia_frame = ttk.Frame(self.music_frame, padding=10)
             trivia_frame.pack(pady=20, fill=tk.X, padx=40)
             
@@ -508,7 +798,7 @@ class RetroDay:
             
             trivia_text = tk.Label(
                 trivia_frame,
-                text=random.choice(music_data["trivia"]),
+                text=random.choice(music_data.trivia),
                 font=("Arial", 11),
                 wraplength=800,
                 justify="left"
@@ -539,7 +829,7 @@ class RetroDay:
             return
         
         # Display gadgets
-        if "gadgets" in tech_data and tech_data["gadgets"]:
+        if tech_data.gadgets:
             gadgets_label = tk.Label(
                 self.technology_frame,
                 text="Popular Gadgets",
@@ -550,7 +840,7 @@ class RetroDay:
             gadgets_frame = ttk.Frame(self.technology_frame)
             gadgets_frame.pack(pady=10, fill=tk.X, padx=40)
             
-            for i, gadget in enumerate(tech_data["gadgets"]):
+            for i, gadget in enumerate(tech_data.gadgets):
                 gadget_frame = ttk.Frame(gadgets_frame, padding=5)
                 gadget_frame.pack(fill=tk.X, pady=5)
                 
@@ -564,7 +854,7 @@ class RetroDay:
                 gadget_text.pack(side=tk.LEFT)
         
         # Display tech milestones
-        if "milestones" in tech_data and tech_data["milestones"]:
+        if tech_data.milestones:
             milestones_label = tk.Label(
                 self.technology_frame,
                 text="Tech Milestones",
@@ -575,7 +865,7 @@ class RetroDay:
             milestones_frame = ttk.Frame(self.technology_frame)
             milestones_frame.pack(pady=10, fill=tk.X, padx=40)
             
-            for milestone in tech_data["milestones"]:
+            for milestone in tech_data.milestones:
                 milestone_frame = ttk.Frame(milestones_frame, padding=5)
                 milestone_frame.pack(fill=tk.X, pady=5)
                 
@@ -590,7 +880,7 @@ class RetroDay:
                 milestone_text.pack(side=tk.LEFT)
         
         # Display internet/computers state
-        if "computing" in tech_data:
+        if tech_data.computing:
             computing_frame = ttk.Frame(self.technology_frame, padding=10)
             computing_frame.pack(pady=20, fill=tk.X, padx=40)
             
@@ -603,7 +893,7 @@ class RetroDay:
             
             computing_text = tk.Label(
                 computing_frame,
-                text=tech_data["computing"],
+                text=tech_data.computing,
                 font=("Arial", 11),
                 wraplength=800,
                 justify="left"
@@ -634,7 +924,7 @@ class RetroDay:
             return
         
         # Display clothing trends
-        if "clothing" in fashion_data and fashion_data["clothing"]:
+        if fashion_data.clothing:
             clothing_label = tk.Label(
                 self.fashion_frame,
                 text="Clothing Trends",
@@ -645,7 +935,7 @@ class RetroDay:
             clothing_frame = ttk.Frame(self.fashion_frame)
             clothing_frame.pack(pady=10, fill=tk.X, padx=40)
             
-            for trend in fashion_data["clothing"]:
+            for trend in fashion_data.clothing:
                 trend_frame = ttk.Frame(clothing_frame, padding=5)
                 trend_frame.pack(fill=tk.X, pady=5)
                 
@@ -660,7 +950,7 @@ class RetroDay:
                 trend_text.pack(side=tk.LEFT)
         
         # Display hairstyles
-        if "hairstyles" in fashion_data and fashion_data["hairstyles"]:
+        if fashion_data.hairstyles:
             hair_label = tk.Label(
                 self.fashion_frame,
                 text="Popular Hairstyles",
@@ -671,7 +961,7 @@ class RetroDay:
             hair_frame = ttk.Frame(self.fashion_frame)
             hair_frame.pack(pady=10, fill=tk.X, padx=40)
             
-            for style in fashion_data["hairstyles"]:
+            for style in fashion_data.hairstyles:
                 style_frame = ttk.Frame(hair_frame, padding=5)
                 style_frame.pack(fill=tk.X, pady=5)
                 
@@ -686,7 +976,7 @@ class RetroDay:
                 style_text.pack(side=tk.LEFT)
         
         # Fashion icons
-        if "icons" in fashion_data and fashion_data["icons"]:
+        if fashion_data.icons:
             icons_label = tk.Label(
                 self.fashion_frame,
                 text="Fashion Icons",
@@ -697,7 +987,7 @@ class RetroDay:
             icons_frame = ttk.Frame(self.fashion_frame)
             icons_frame.pack(pady=10, fill=tk.X, padx=40)
             
-            for icon in fashion_data["icons"]:
+            for icon in fashion_data.icons:
                 icon_frame = ttk.Frame(icons_frame, padding=5)
                 icon_frame.pack(fill=tk.X, pady=5)
                 
@@ -709,333 +999,25 @@ class RetroDay:
                 )
                 icon_text.pack(side=tk.LEFT)
     
-    def get_historical_events(self, date):
-        """Get historical events for the given date"""
-        try:
-            # Format date for Wikipedia query
-            month_name = date.strftime("%B")
-            day = date.day
-            
-            # Try to get events from Wikipedia
-            wiki_page = f"{month_name}_{day}"
-            try:
-                page = wikipedia.page(wiki_page)
-                content = page.content
-                
-                # Extract events for the year or decade
-                year = date.year
-                decade = (year // 10) * 10
-                
-                events = []
-                
-                # Extract events for the specific year if available
-                year_pattern = re.compile(rf"{year}.*?–\s*(.*?)(?=\n\n|\n\d|\Z)", re.DOTALL)
-                year_matches = year_pattern.findall(content)
-                
-                if year_matches:
-                    for match in year_matches:
-                        # Split by newline and process each event
-                        for event in match.split("\n"):
-                            if event.strip():
-                                events.append(f"{year}: {event.strip()}")
-                
-                # If no specific events for the year, look for the decade
-                if not events:
-                    decade_pattern = re.compile(rf"{decade}s.*?–\s*(.*?)(?=\n\n|\n\d|\Z)", re.DOTALL)
-                    decade_matches = decade_pattern.findall(content)
-                    
-                    if decade_matches:
-                        for match in decade_matches:
-                            for event in match.split("\n"):
-                                if event.strip():
-                                    events.append(f"{decade}s: {event.strip()}")
-                                # If still no events, look for general "Events" section
-                if not events:
-                    events_section = re.search(r"== Events ==(.*?)(?==\=|\Z)", content, re.DOTALL)
-                    if events_section:
-                        events_text = events_section.group(1)
-                        # Extract bullet points or specific years
-                        event_items = re.findall(r"\*\s*(.*?\d{4}.*?)(?=\n\*|\n\n|\Z)", events_text)
-                        events.extend(event_items)
-                
-                return events[:10]  # Return up to 10 events
-            
-            except wikipedia.exceptions.PageError:
-                # Fallback to scraping on this day in history websites
-                try:
-                    url = f"https://www.onthisday.com/day/{month_name.lower()}/{day}"
-                    response = requests.get(url)
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    events = []
-                    event_sections = soup.find_all('section', class_='event-list')
-                    
-                    for section in event_sections:
-                        year = section.find('h3').get_text().strip()
-                        event_items = section.find_all('li')
-                        
-                        for item in event_items:
-                            event_text = item.get_text().strip()
-                            events.append(f"{year}: {event_text}")
-                    
-                    return events[:10]
-                
-                except Exception:
-                    pass
-            
-            # Final fallback - return some generic events based on decade
-            decade = (date.year // 10) * 10
-            decade_events = {
-                1950: [
-                    "The post-war economic boom leads to suburban expansion",
-                    "Rock 'n' roll music emerges as a cultural force",
-                    "The Cold War begins between the US and Soviet Union"
-                ],
-                1960: [
-                    "Civil Rights Movement gains momentum",
-                    "The Beatles revolutionize popular music",
-                    "Humans land on the moon (1969)"
-                ],
-                # Add more decades as needed
-            }
-            
-            return decade_events.get(decade, ["No specific historical events found for this date."])
-        
-        except Exception as e:
-            print(f"Error getting historical events: {e}")
-            return ["Could not retrieve historical events."]
-    
-    def get_movies_and_tv(self, date):
-        """Get popular movies and TV shows from around the given date"""
-        try:
-            year = date.year
-            decade = (year // 10) * 10
-            
-            # Try to use TMDB API if available
-            if self.tmdb_api_key:
-                try:
-                    # Get popular movies from that year
-                    url = f"https://api.themoviedb.org/3/discover/movie?api_key={self.tmdb_api_key}" \
-                          f"&primary_release_year={year}&sort_by=popularity.desc"
-                    
-                    response = requests.get(url)
-                    data = response.json()
-                    
-                    movies = []
-                    for movie in data.get('results', [])[:5]:  # Get top 5
-                        movie_data = {
-                            'title': movie.get('title', 'Unknown'),
-                            'year': year,
-                            'id': movie.get('id'),
-                            'poster_url': f"https://image.tmdb.org/t/p/w500{movie.get('poster_path', '')}" if movie.get('poster_path') else None
-                        }
-                        
-                        # Get director info if available
-                        credits_url = f"https://api.themoviedb.org/3/movie/{movie['id']}/credits?api_key={self.tmdb_api_key}"
-                        credits_response = requests.get(credits_url)
-                        credits_data = credits_response.json()
-                        
-                        for person in credits_data.get('crew', []):
-                            if person.get('job') == 'Director':
-                                movie_data['director'] = person.get('name')
-                                break
-                        
-                        movies.append(movie_data)
-                    
-                    return movies
-                
-                except Exception:
-                    pass
-            
-            # Fallback to decade-based movie data
-            decade_movies = {
-                1950: [
-                    {"title": "Singin' in the Rain", "year": 1952, "director": "Gene Kelly, Stanley Donen"},
-                    {"title": "Rear Window", "year": 1954, "director": "Alfred Hitchcock"},
-                    {"title": "Some Like It Hot", "year": 1959, "director": "Billy Wilder"}
-                ],
-                1960: [
-                    {"title": "Psycho", "year": 1960, "director": "Alfred Hitchcock"},
-                    {"title": "The Sound of Music", "year": 1965, "director": "Robert Wise"},
-                    {"title": "2001: A Space Odyssey", "year": 1968, "director": "Stanley Kubrick"}
-                ],
-                # Add more decades as needed
-            }
-            
-            return decade_movies.get(decade, [
-                {"title": "No specific movie data available", "year": year}
-            ])
-        
-        except Exception as e:
-            print(f"Error getting movies: {e}")
-            return [{"title": "Could not retrieve movie data", "year": date.year}]
-    
-    def get_music(self, date):
-        """Get popular music from around the given date"""
-        try:
-            year = date.year
-            decade = (year // 10) * 10
-            
-            # Try to use Last.fm or other music API if available
-            # (Implementation would depend on having API access)
-            
-            # Fallback to decade-based music data
-            decade_music = {
-                1950: {
-                    "songs": [
-                        {"title": "Hound Dog", "artist": "Elvis Presley"},
-                        {"title": "Johnny B. Goode", "artist": "Chuck Berry"},
-                        {"title": "What'd I Say", "artist": "Ray Charles"}
-                    ],
-                    "artists": ["Elvis Presley", "Chuck Berry", "Little Richard", "Frank Sinatra"],
-                    "trivia": [
-                        "Rock 'n' roll emerged in the mid-1950s, blending rhythm and blues with country music.",
-                        "The 45 rpm single became the standard format for hit songs."
-                    ]
-                },
-                1960: {
-                    "songs": [
-                        {"title": "Hey Jude", "artist": "The Beatles"},
-                        {"title": "(I Can't Get No) Satisfaction", "artist": "The Rolling Stones"},
-                        {"title": "Respect", "artist": "Aretha Franklin"}
-                    ],
-                    "artists": ["The Beatles", "The Rolling Stones", "Bob Dylan", "Aretha Franklin"],
-                    "trivia": [
-                        "The British Invasion, led by The Beatles, changed American music in 1964.",
-                        "Woodstock Festival in 1969 became a defining moment for 1960s counterculture."
-                    ]
-                },
-                # Add more decades as needed
-            }
-            
-            return decade_music.get(decade, {
-                "songs": [{"title": "No specific song data available", "artist": "Unknown"}],
-                "artists": ["No artist data available"],
-                "trivia": ["No music trivia available for this period."]
-            })
-        
-        except Exception as e:
-            print(f"Error getting music: {e}")
-            return {
-                "songs": [{"title": "Could not retrieve music data", "artist": "Error"}],
-                "artists": ["Error"],
-                "trivia": ["Could not retrieve music trivia."]
-            }
-    
-    def get_technology(self, date):
-        """Get technology trends from around the given date"""
-        try:
-            year = date.year
-            decade = (year // 10) * 10
-            
-            decade_tech = {
-                1950: {
-                    "gadgets": ["Transistor radio", "Black-and-white TV", "Electric typewriter"],
-                    "milestones": [
-                        "First commercial computer (UNIVAC I) released in 1951",
-                        "First transistor radio introduced in 1954",
-                        "Sputnik 1, the first artificial satellite, launched in 1957"
-                    ],
-                    "computing": "Computers were room-sized machines used mainly by governments and large corporations. Programming was done with punch cards."
-                },
-                1960: {
-                    "gadgets": ["Portable cassette player", "Color TV", "Electronic calculator"],
-                    "milestones": [
-                        "First video game (Spacewar!) created in 1962",
-                        "ARPANET, precursor to the internet, developed in 1969",
-                        "First human on the moon in 1969"
-                    ],
-                    "computing": "Mainframe computers became more widespread in businesses. The concept of personal computing was still in its infancy."
-                },
-                # Add more decades as needed
-            }
-            
-            return decade_tech.get(decade, {
-                "gadgets": ["No specific gadget data available"],
-                "milestones": ["No specific tech milestones available"],
-                "computing": "No computing information available for this period."
-            })
-        
-        except Exception as e:
-            print(f"Error getting technology: {e}")
-            return {
-                "gadgets": ["Could not retrieve gadget data"],
-                "milestones": ["Could not retrieve tech milestones"],
-                "computing": "Could not retrieve computing information."
-            }
-    
-    def get_fashion(self, date):
-        """Get fashion trends from around the given date"""
-        try:
-            year = date.year
-            decade = (year // 10) * 10
-            
-            decade_fashion = {
-                1950: {
-                    "clothing": [
-                        "Poodle skirts with sweater sets",
-                        "Men's suits with narrow ties",
-                        "Pedal pushers and saddle shoes"
-                    ],
-                    "hairstyles": [
-                        "Pompadour for men",
-                        "Poodle cut for women",
-                        "Ducktail hairstyle"
-                    ],
-                    "icons": ["Marilyn Monroe", "James Dean", "Audrey Hepburn"]
-                },
-                1960: {
-                    "clothing": [
-                        "Mini skirts and go-go boots",
-                        "Mod suits with skinny ties",
-                        "Tie-dye and psychedelic prints"
-                    ],
-                    "hairstyles": [
-                        "Beehive hairdos",
-                        "Long, straight hair (hippie style)",
-                        "The Beatles mop-top"
-                    ],
-                    "icons": ["Twiggy", "The Beatles", "Jacqueline Kennedy"]
-                },
-                # Add more decades as needed
-            }
-            
-            return decade_fashion.get(decade, {
-                "clothing": ["No specific clothing data available"],
-                "hairstyles": ["No specific hairstyle data available"],
-                "icons": ["No fashion icons available for this period"]
-            })
-        
-        except Exception as e:
-            print(f"Error getting fashion: {e}")
-            return {
-                "clothing": ["Could not retrieve clothing data"],
-                "hairstyles": ["Could not retrieve hairstyle data"],
-                "icons": ["Could not retrieve fashion icons"]
-            }
-    
     def download_image(self, url, filename):
         """Download and cache an image from a URL"""
         try:
-            # Check cache first
+            # Cached images are reused; concurrent requests share one download
             cache_path = os.path.join("cache", f"{filename}.jpg")
-            if os.path.exists(cache_path):
-                return cache_path
-            
-            # Download the image
-            response = requests.get(url)
-            if response.status_code == 200:
-                with open(cache_path, 'wb') as f:
-                    f.write(response.content)
-                return cache_path
+            return download_to_cache(url, cache_path)
         
         except Exception as e:
             print(f"Error downloading image: {e}")
             return None
 
 def main():
+    parser = argparse.ArgumentParser(description="RetroDay - Your Time Capsule")
+    parser.add_argument("--profile", action="store_true",
+                        help="write a sampling profile of every time travel to profiles/")
+    args = parser.parse_args()
+    
     root = ThemedTk(theme="equilux")  # Using a themed Tkinter window
-    app = RetroDay(root)
+    app = RetroDay(root, profile=args.profile)
     root.mainloop()
 
 if __name__ == "__main__":
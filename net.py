@@ -0,0 +1,434 @@
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# (connect, read) timeouts in seconds for every upstream request
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Query parameters left out of fixture keys and recordings
+SECRET_PARAMS = {"api_key"}
+
+
+class OfflineError(requests.ConnectionError):
+    """Raised without touching the network while the monitor considers us offline"""
+
+
+class ConnectivityMonitor:
+    """Tracks whether upstream services are reachable
+
+    The first connection failure or timeout switches every provider to
+    offline mode, so the following calls fail immediately instead of each
+    waiting for its own timeout. Every `retry_after` seconds one request is
+    let through as a probe; if it succeeds we are back online. Batch tools
+    turn `fail_fast` off, so a single timeout only fails its own request.
+    """
+
+    def __init__(self, retry_after=30.0, fail_fast=True):
+        self.retry_after = retry_after
+        self.fail_fast = fail_fast
+        self.lock = threading.Lock()
+        self.online = True
+        self.retry_at = 0.0
+
+    def allow(self):
+        """Return True if a request may go out now"""
+        with self.lock:
+            if self.online or not self.fail_fast:
+                return True
+            now = time.monotonic()
+            if now < self.retry_at:
+                return False
+            # Let this request through as a probe, hold back the rest
+            self.retry_at = now + self.retry_after
+            return True
+
+    def report_success(self):
+        with self.lock:
+            self.online = True
+
+    def report_failure(self):
+        with self.lock:
+            self.online = False
+            self.retry_at = time.monotonic() + self.retry_after
+
+
+class NegativeCache:
+    """Remembers failed lookups (missing pages, 404 posters, ...) for a short TTL"""
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.expiry = {}
+
+    def hit(self, key):
+        """Return True if `key` failed recently"""
+        with self.lock:
+            expires = self.expiry.get(key)
+            if expires is None:
+                return False
+            if time.monotonic() >= expires:
+                del self.expiry[key]
+                return False
+            return True
+
+    def add(self, key, ttl=None):
+        with self.lock:
+            self.expiry[key] = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+    def clear(self):
+        with self.lock:
+            self.expiry.clear()
+
+
+class HostLimiter:
+    """Token-bucket rate limit plus an adaptive (AIMD) concurrency limit for one host
+
+    Requests wait for a token (refilled at `rate` per second, up to `burst`)
+    and for a free slot in the concurrency window. The window grows by about
+    one slot per window's worth of fast responses and is halved on a 429 /
+    Retry-After or when responses get slower than `target_latency`, which
+    keeps throughput near what the upstream allows without being throttled.
+    It is halved at most once per window: requests that were already in
+    flight saw the same conditions, so their results don't halve it again.
+    """
+
+    def __init__(self, rate, burst=None, max_concurrency=4, target_latency=2.0):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.cond = threading.Condition()
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.completed = 0
+        self.decrease_after = 0
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def acquire(self):
+        """Block until a request to this host may start"""
+        start = time.monotonic()
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.in_flight >= int(self.limit):
+                    delay = None  # Woken up by release()
+                elif self.tokens < 1:
+                    delay = (1 - self.tokens) / self.rate
+                else:
+                    break
+                self.cond.wait(delay)
+            self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self.waited += time.monotonic() - start
+
+    def release(self, latency, throttled=False, retry_after=None):
+        """Record the outcome of a request started with `acquire`"""
+        with self.cond:
+            self.in_flight -= 1
+            self.completed += 1
+            if throttled:
+                self.throttled += 1
+                self._decrease()
+                self.blocked_until = max(self.blocked_until, time.monotonic() + (retry_after or 1.0))
+            elif latency > self.target_latency:
+                self._decrease()
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self.cond.notify_all()
+
+    def _decrease(self):
+        if self.completed < self.decrease_after:
+            return
+        # Ignore the rest of the current window before halving again
+        self.decrease_after = self.completed + int(self.limit)
+        self.limit = max(1.0, self.limit / 2)
+
+    def stats(self):
+        with self.cond:
+            return {
+                "rate": self.rate,
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "tokens": round(self.tokens, 2),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.waited, 3),
+            }
+
+
+# Per-host (rate per second, max concurrency); anything else uses DEFAULT_LIMITS
+HOST_LIMITS = {
+    "api.themoviedb.org": (20, 8),
+    "image.tmdb.org": (20, 8),
+    "en.wikipedia.org": (5, 2),
+    "www.onthisday.com": (2, 2),
+}
+DEFAULT_LIMITS = (10, 4)
+
+
+class FixtureMissing(requests.RequestException):
+    """Raised in replay mode for a request that was never recorded"""
+
+
+class LiveTransport:
+    """Sends requests to the real services"""
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+
+class FixtureStore:
+    """Directory of recorded responses, one JSON file per request"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def request_url(url, params=None):
+        """Full request URL with its query string sorted and secrets removed"""
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        parts = urlsplit(full_url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def file_for(self, url):
+        return os.path.join(self.path, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def save(self, url, response):
+        record = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "retry-after")},
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        tmp_path = self.file_for(url) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self.file_for(url))
+
+    def load(self, url):
+        """Return the recorded response for `url` as a requests.Response, or None"""
+        try:
+            with open(self.file_for(url), "r") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        response = requests.Response()
+        response.url = record["url"]
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(record["body"])
+        response._content_consumed = True
+        return response
+
+
+class RecordingTransport:
+    """Sends requests to the real services and saves every response to a FixtureStore"""
+
+    def __init__(self, store, inner=None):
+        self.store = store
+        self.inner = inner or LiveTransport()
+
+    def get(self, url, **kwargs):
+        response = self.inner.get(url, **kwargs)
+        self.store.save(self.store.request_url(url, kwargs.get("params")), response)
+        return response
+
+
+class ReplayTransport:
+    """Serves recorded responses without any network access
+
+    `latency` (seconds) and `bandwidth` (bytes per second) simulate a slow
+    link, and `error_rate` makes that fraction of requests fail with a
+    connection error. Pass a `seed` for a reproducible error pattern.
+    """
+
+    def __init__(self, store, latency=0.0, bandwidth=None, error_rate=0.0, seed=None):
+        self.store = store
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        request_url = self.store.request_url(url, kwargs.get("params"))
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            failed = self.error_rate and self.random.random() < self.error_rate
+        if failed:
+            raise requests.ConnectionError(f"Injected failure for {request_url}")
+
+        response = self.store.load(request_url)
+        if response is None:
+            raise FixtureMissing(f"No recorded response for {request_url}")
+        if self.bandwidth:
+            time.sleep(len(response.content) / self.bandwidth)
+        return response
+
+
+def transport_from_env():
+    """Pick the transport from RETRODAY_HTTP_MODE (live, record or replay)
+
+    RETRODAY_FIXTURES names the fixture directory (default "fixtures"); in
+    replay mode RETRODAY_LATENCY_MS, RETRODAY_BANDWIDTH_KBPS,
+    RETRODAY_ERROR_RATE and RETRODAY_SEED shape the simulated network.
+    """
+    mode = os.environ.get("RETRODAY_HTTP_MODE", "live")
+    if mode == "live":
+        return LiveTransport()
+
+    store = FixtureStore(os.environ.get("RETRODAY_FIXTURES", "fixtures"))
+    if mode == "record":
+        return RecordingTransport(store)
+    if mode == "replay":
+        bandwidth = float(os.environ.get("RETRODAY_BANDWIDTH_KBPS", 0)) * 1024
+        seed = os.environ.get("RETRODAY_SEED")
+        return ReplayTransport(
+            store,
+            latency=float(os.environ.get("RETRODAY_LATENCY_MS", 0)) / 1000,
+            bandwidth=bandwidth or None,
+            error_rate=float(os.environ.get("RETRODAY_ERROR_RATE", 0)),
+            seed=int(seed) if seed is not None else None,
+        )
+    raise ValueError(f"Unknown RETRODAY_HTTP_MODE: {mode}")
+
+
+monitor = ConnectivityMonitor()
+failures = NegativeCache()
+transport = transport_from_env()
+limiters = {}
+limiters_lock = threading.Lock()
+
+# Times a throttled (429) request is retried after its Retry-After delay
+MAX_THROTTLE_RETRIES = 2
+MAX_RETRY_AFTER = 30.0
+
+
+def limiter_for(url):
+    """The shared HostLimiter for the host of `url`"""
+    host = urlsplit(url).hostname or ""
+    with limiters_lock:
+        limiter = limiters.get(host)
+        if limiter is None:
+            rate, max_concurrency = HOST_LIMITS.get(host, DEFAULT_LIMITS)
+            limiter = limiters[host] = HostLimiter(rate, max_concurrency=max_concurrency)
+        return limiter
+
+
+def limiter_stats():
+    """Snapshot of every host limiter's state, for metrics and benchmarks"""
+    with limiters_lock:
+        hosts = dict(limiters)
+    return {host: limiter.stats() for host, limiter in hosts.items()}
+
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header given in seconds (HTTP dates are treated as missing)"""
+    try:
+        return min(MAX_RETRY_AFTER, float(response.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+def set_transport(new_transport):
+    """Swap the transport under every provider call (e.g. a ReplayTransport in benchmarks)"""
+    global transport
+    transport = new_transport
+
+
+def set_fail_fast(enabled):
+    """Turn failing fast while offline on (the default, for the UI) or off (for batch tools)"""
+    monitor.fail_fast = enabled
+
+
+def reset():
+    """Forget connectivity state and cached failures"""
+    monitor.report_success()
+    failures.clear()
+
+
+def get(url, **kwargs):
+    """requests.get with a default timeout, per-host rate limiting, and failing fast while offline"""
+    response, finish = _send(url, **kwargs)
+    finish()
+    return response
+
+
+@contextmanager
+def stream(url, **kwargs):
+    """Like get(url, stream=True), but holds the host's concurrency slot until the body has been read
+
+    The response is closed on exit. The limiter judges the response on its
+    time to first byte, so a large body on a slow link does not count as an
+    overloaded host.
+    """
+    response, finish = _send(url, stream=True, **kwargs)
+    try:
+        yield response
+    except (requests.ConnectionError, requests.Timeout):
+        monitor.report_failure()
+        raise
+    finally:
+        response.close()
+        finish()
+
+
+def _send(url, **kwargs):
+    """Send a GET through the limiter; returns the response and a callable that releases its slot"""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    limiter = limiter_for(url)
+
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        if not monitor.allow():
+            raise OfflineError(f"Offline, skipped request to {url}")
+
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = transport.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            limiter.release(time.monotonic() - start)
+            monitor.report_failure()
+            raise
+        except Exception:
+            limiter.release(time.monotonic() - start)
+            raise
+
+        # With stream=True this is the time to first byte, the body is read later
+        latency = time.monotonic() - start
+        retry_after = retry_after_seconds(response)
+        throttled = response.status_code == 429 or (response.status_code == 503 and retry_after is not None)
+        monitor.report_success()
+        if throttled and attempt < MAX_THROTTLE_RETRIES:
+            # Give the connection back before waiting out Retry-After
+            response.close()
+            limiter.release(latency, throttled=True, retry_after=retry_after)
+            continue
+        return response, lambda: limiter.release(latency, throttled=throttled, retry_after=retry_after)
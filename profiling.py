@@ -0,0 +1,113 @@
+"""Low-overhead sampling profiler for the time-travel pipeline.
+
+Enable it with ``python main.py --profile`` or ``RETRODAY_PROFILE=1``. Every
+time travel then writes two files to ``profiles/`` (or $RETRODAY_PROFILE_DIR):
+
+- ``<name>.collapsed``: one "frame;frame;frame count" line per stack, the
+  folded format read by flamegraph.pl, speedscope and inferno.
+- ``<name>.txt``: the top functions by self and inclusive samples.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+# Leaf frames of a thread that is waiting rather than working; counted as idle, not as hot spots
+IDLE_FUNCTIONS = {"mainloop", "wait", "sleep", "_wait_for_tstate_lock", "select", "poll"}
+
+
+def enabled():
+    return os.environ.get("RETRODAY_PROFILE", "") not in ("", "0")
+
+
+def output_dir():
+    return os.environ.get("RETRODAY_PROFILE_DIR", "profiles")
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples thread stacks `1 / interval` times a second
+
+    Only the threads whose idents are in `threads` are sampled (every other
+    thread if it is None). Samples whose leaf frame is in IDLE_FUNCTIONS are
+    only counted in `idle`.
+    """
+
+    def __init__(self, interval=0.005, threads=None):
+        self.interval = interval
+        self.threads = set(threads) if threads is not None else None
+        self.stacks = Counter()
+        self.samples = 0
+        self.idle = 0
+        self.stopped = threading.Event()
+        self.thread = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.threads is not None and thread_id not in self.threads):
+                    continue
+                if frame.f_code.co_name in IDLE_FUNCTIONS:
+                    self.idle += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Stacks in folded format, root first"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top=25):
+        """Top-N functions by self samples (leaf frame) and inclusive samples (anywhere on the stack)"""
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                inclusive[label] += count
+
+        total = sum(self.stacks.values()) or 1
+        lines = [f"{self.samples} samples over {self.elapsed:.3f}s "
+                 f"({sum(self.stacks.values())} busy thread stacks, {self.idle} idle)", ""]
+        for title, counter in (("Self", own), ("Inclusive", inclusive)):
+            lines.append(f"Top {top} by {title.lower()} samples:")
+            for label, count in counter.most_common(top):
+                lines.append(f"  {count:7d} {100 * count / total:6.1f}%  {label}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self, name, directory=None):
+        """Write <name>.collapsed and <name>.txt; returns the summary path"""
+        directory = directory or output_dir()
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, name)
+        with open(f"{base}.collapsed", "w") as f:
+            f.write(self.collapsed())
+        with open(f"{base}.txt", "w") as f:
+            f.write(self.summary())
+        return f"{base}.txt"
@@ -0,0 +1,149 @@
+import re
+import requests
+import wikipedia
+from bs4 import BeautifulSoup
+
+import net
+
+# Matches "1969 – Apollo 11 ..." lines in a Wikipedia day page
+EVENT_LINE = re.compile(r"^(\d{1,4})\s*–\s*(.+)$")
+
+class NoEventsError(LookupError):
+    """Raised when no source has any events for a day"""
+
+
+WIKIPEDIA_API = "https://en.wikipedia.org/w/api.php"
+USER_AGENT = "RetroDay (https://github.com/nicatbayram/retro-day)"
+
+
+def fetch_wikipedia_day(month_name, day):
+    """Return the plain-text content of the Wikipedia page for a day (e.g. July_20)"""
+    title = f"{month_name}_{day}"
+    if net.failures.hit(("wikipedia", title)):
+        raise wikipedia.exceptions.PageError(None, title)
+
+    # Query the API directly (as the wikipedia package does) so the request
+    # gets a timeout and goes through the connectivity monitor
+    params = {
+        "action": "query",
+        "prop": "extracts",
+        "explaintext": 1,
+        "redirects": 1,
+        "titles": title,
+        "format": "json",
+        "formatversion": 2,
+    }
+    response = net.get(WIKIPEDIA_API, params=params, headers={"User-Agent": USER_AGENT})
+    response.raise_for_status()
+    pages = response.json().get("query", {}).get("pages", [])
+    if not pages or pages[0].get("missing") or not pages[0].get("extract"):
+        net.failures.add(("wikipedia", title))
+        raise wikipedia.exceptions.PageError(None, title)
+    return pages[0]["extract"]
+
+
+def fetch_onthisday(month_name, day):
+    """Scrape onthisday.com for a day and return (year, event) pairs"""
+    url = f"https://www.onthisday.com/day/{month_name.lower()}/{day}"
+    if net.failures.hit(url):
+        raise requests.HTTPError(f"Recently failed: {url}")
+
+    response = net.get(url)
+    if response.status_code != 200:
+        net.failures.add(url)
+        response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    events = []
+    for section in soup.find_all('section', class_='event-list'):
+        year = section.find('h3').get_text().strip()
+        for item in section.find_all('li'):
+            events.append((year, item.get_text().strip()))
+    return events
+
+
+def iter_wikipedia_events(content):
+    """Yield (year, event) pairs from the "Events" section of a Wikipedia day page as they are found"""
+    # Only look at the "Events" section so births and deaths are left out
+    section = re.search(r"== Events ==(.*?)(?=\n== [^=]|\Z)", content, re.DOTALL)
+    text = section.group(1) if section else content
+
+    for line in text.split("\n"):
+        match = EVENT_LINE.match(line.strip())
+        if match:
+            yield int(match.group(1)), match.group(2).strip()
+
+
+def index_wikipedia_events(content):
+    """Group the events of a Wikipedia day page by year: {1969: ["...", ...]}"""
+    by_year = {}
+    for year, event in iter_wikipedia_events(content):
+        by_year.setdefault(year, []).append(event)
+    return by_year
+
+
+def index_onthisday_events(pairs):
+    """Group (year, event) pairs from onthisday.com by year"""
+    by_year = {}
+    for year, event in pairs:
+        if year.isdigit():
+            by_year.setdefault(int(year), []).append(event)
+    return by_year
+
+
+def fetch_day_events(month_name, day):
+    """Get {year: [events]} for a day from Wikipedia, falling back to onthisday.com
+
+    Raises NoEventsError if neither source has any events for the day, so an
+    unparseable page is treated as a failed fetch rather than an empty day.
+    """
+    try:
+        by_year = index_wikipedia_events(fetch_wikipedia_day(month_name, day))
+        if by_year:
+            return by_year
+    except wikipedia.exceptions.PageError:
+        pass
+
+    by_year = index_onthisday_events(fetch_onthisday(month_name, day))
+    if not by_year:
+        raise NoEventsError(f"No events found for {month_name} {day}")
+    return by_year
+
+
+def fetch_tmdb_movies(api_key, year, limit=5):
+    """Get the most popular movies released in a year from TMDB, with directors"""
+    url = f"https://api.themoviedb.org/3/discover/movie?api_key={api_key}" \
+          f"&primary_release_year={year}&sort_by=popularity.desc"
+
+    failure_key = ("tmdb", year)
+    if net.failures.hit(failure_key):
+        raise requests.HTTPError(f"TMDB lookup for {year} failed recently")
+
+    response = net.get(url)
+    if response.status_code != 200:
+        net.failures.add(failure_key)
+        response.raise_for_status()
+    data = response.json()
+
+    movies = []
+    for movie in data.get('results', [])[:limit]:
+        movie_data = {
+            'title': movie.get('title', 'Unknown'),
+            'year': year,
+            'id': movie.get('id'),
+            'poster_url': f"https://image.tmdb.org/t/p/w500{movie.get('poster_path', '')}" if movie.get('poster_path') else None
+        }
+
+        # Get director info if available
+        credits_url = f"https://api.themoviedb.org/3/movie/{movie['id']}/credits?api_key={api_key}"
+        credits_response = net.get(credits_url)
+        credits_data = credits_response.json()
+
+        for person in credits_data.get('crew', []):
+            if person.get('job') == 'Director':
+                movie_data['director'] = person.get('name')
+                break
+
+        movies.append(movie_data)
+
+    return movies
@@ -0,0 +1,152 @@
+"""Immutable record types that time capsules are made of.
+
+Records are NamedTuples: they have no per-instance __dict__, can't be
+changed after they are built, pickle compactly and can be shared between
+worker threads, the capsule cache and the UI without copying. Strings that
+come from upstream data are interned, so the same title or event text seen in
+many capsules is stored once. Unpickling interns them again and maps
+records registered with `shared` (the curated decade data) back to their one
+instance, so capsules read from the disk cache stay about as small as
+freshly built ones.
+"""
+import sys
+from typing import NamedTuple, Optional, Tuple
+
+
+def intern(text):
+    """sys.intern for strings, anything else (None, ids) is returned as is"""
+    return sys.intern(text) if isinstance(text, str) else text
+
+
+_shared = {}
+_shared_ids = set()
+
+
+def shared(record):
+    """Return the registered record of the same type equal to `record`, registering it if needed"""
+    record = _shared.setdefault((type(record), record), record)
+    _shared_ids.add(id(record))
+    return record
+
+
+def _interned(value):
+    if type(value) is tuple:
+        return tuple(_interned(item) for item in value)
+    return intern(value)
+
+
+def _load(cls, fields):
+    """Unpickle a record with its strings interned"""
+    return cls(*map(_interned, fields))
+
+
+def _load_shared(cls, fields):
+    """Unpickle a record that was pickled from a registered instance, as that instance"""
+    record = _load(cls, fields)
+    return _shared.get((cls, record), record)
+
+
+def _reduce(self):
+    # Registered records live for good, so their ids stay unique; anything else
+    # (capsules, upstream events and movies) skips the registry lookup on load
+    load = _load_shared if id(self) in _shared_ids else _load
+    return load, (type(self), tuple(self))
+
+
+class Event(NamedTuple):
+    text: str
+    year: Optional[int] = None
+
+    @classmethod
+    def make(cls, text, year=None):
+        return cls(intern(text), year)
+
+    def __str__(self):
+        return f"{self.year}: {self.text}" if self.year is not None else self.text
+
+
+class Movie(NamedTuple):
+    title: str
+    year: Optional[int] = None
+    director: Optional[str] = None
+    id: Optional[int] = None
+    poster_url: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Movie from a TMDB or bundle movie dict"""
+        return cls(
+            intern(data.get("title", "Unknown Title")),
+            data.get("year"),
+            intern(data.get("director")),
+            data.get("id"),
+            intern(data.get("poster_url")),
+        )
+
+    def to_dict(self):
+        return {key: value for key, value in self._asdict().items() if value is not None}
+
+
+class Song(NamedTuple):
+    title: str
+    artist: str
+
+
+class Music(NamedTuple):
+    songs: Tuple[Song, ...]
+    artists: Tuple[str, ...]
+    trivia: Tuple[str, ...]
+
+    def to_dict(self):
+        return {
+            "songs": [song._asdict() for song in self.songs],
+            "artists": list(self.artists),
+            "trivia": list(self.trivia),
+        }
+
+
+class Technology(NamedTuple):
+    gadgets: Tuple[str, ...]
+    milestones: Tuple[str, ...]
+    computing: str
+
+    def to_dict(self):
+        return {"gadgets": list(self.gadgets), "milestones": list(self.milestones), "computing": self.computing}
+
+
+class Fashion(NamedTuple):
+    clothing: Tuple[str, ...]
+    hairstyles: Tuple[str, ...]
+    icons: Tuple[str, ...]
+
+    def to_dict(self):
+        return {"clothing": list(self.clothing), "hairstyles": list(self.hairstyles), "icons": list(self.icons)}
+
+
+class Capsule(NamedTuple):
+    date: object
+    decade_style: str
+    events: Tuple[Event, ...]
+    movies: Tuple[Movie, ...]
+    music: Music
+    technology: Technology
+    fashion: Fashion
+    # False when a fetch failed and events or movies are generic decade fallbacks
+    complete: bool = True
+
+    def to_dict(self):
+        """Plain dicts, lists and strings (the date stays a datetime)"""
+        return {
+            "date": self.date,
+            "decade_style": self.decade_style,
+            "events": [str(event) for event in self.events],
+            "movies": [movie.to_dict() for movie in self.movies],
+            "music": self.music.to_dict(),
+            "technology": self.technology.to_dict(),
+            "fashion": self.fashion.to_dict(),
+        }
+
+
+# NamedTuple classes can't share a base class, so the pickling hook is attached here
+for _cls in (Event, Movie, Song, Music, Technology, Fashion, Capsule):
+    _cls.__reduce__ = _reduce
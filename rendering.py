@@ -0,0 +1,58 @@
+import threading
+
+
+class RenderScheduler:
+    """Coalesces UI updates into a single pass on the Tk main loop
+
+    Worker threads call `schedule` with a key per piece of UI (a tab, the
+    title, ...). Everything scheduled before the main loop gets to it runs in
+    one callback, so Tk lays the window out once instead of once per update.
+    Scheduling the same key again before the flush replaces the older update.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.flush_scheduled = False
+        self.dirty_canvases = set()
+        self.scrollregion_scheduled = False
+
+    def schedule(self, key, func):
+        """Queue `func` to run on the main thread in the next render pass (thread-safe)"""
+        self.schedule_many([(key, func)])
+
+    def schedule_many(self, updates):
+        """Queue several (key, func) updates so they are guaranteed to land in the same pass"""
+        with self.lock:
+            for key, func in updates:
+                self.pending[key] = func
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        self.root.after(0, self.flush)
+
+    def flush(self):
+        """Run every queued update in the order it was first scheduled"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.flush_scheduled = False
+
+        for key, func in pending.items():
+            try:
+                func()
+            except Exception as e:
+                print(f"Error rendering {key}: {e}")
+
+    def invalidate_scrollregion(self, canvas):
+        """Recompute the canvas scrollregion once the current burst of layout changes settles"""
+        self.dirty_canvases.add(canvas)
+        if not self.scrollregion_scheduled:
+            self.scrollregion_scheduled = True
+            self.root.after_idle(self._update_scrollregions)
+
+    def _update_scrollregions(self):
+        canvases, self.dirty_canvases = self.dirty_canvases, set()
+        self.scrollregion_scheduled = False
+        for canvas in canvases:
+            canvas.configure(scrollregion=canvas.bbox("all"))
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+
+DEFAULT_PATH = os.path.join("cache", "events.db")
+
+
+class EventIndex:
+    """Local SQLite FTS5 full-text index over parsed day events
+
+    Days are added as they are fetched or read from the offline bundle, so
+    search never needs the network. Safe to use from several threads.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        try:
+            with self.lock, self.db:
+                self.db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS events "
+                    "USING fts5(text, year UNINDEXED, month UNINDEXED, day UNINDEXED)"
+                )
+                self.db.execute("CREATE TABLE IF NOT EXISTS indexed_days (month INTEGER, day INTEGER, PRIMARY KEY (month, day))")
+        except sqlite3.Error:
+            self.db.close()
+            raise
+
+    def has_day(self, month, day):
+        with self.lock:
+            row = self.db.execute("SELECT 1 FROM indexed_days WHERE month = ? AND day = ?", (month, day)).fetchone()
+        return row is not None
+
+    def add_day(self, month, day, by_year):
+        """(Re)index the events of a day from a {year: [events]} mapping"""
+        rows = [(event, year, month, day) for year, events in by_year.items() for event in events]
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM events WHERE month = ? AND day = ?", (month, day))
+            self.db.executemany("INSERT INTO events (text, year, month, day) VALUES (?, ?, ?, ?)", rows)
+            self.db.execute("INSERT OR REPLACE INTO indexed_days (month, day) VALUES (?, ?)", (month, day))
+
+    def events_for_day(self, month, day):
+        """Return {year: [events]} for an indexed day, or None if the day has no indexed events"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT year, text FROM events WHERE month = ? AND day = ? ORDER BY rowid", (month, day)
+            ).fetchall()
+        by_year = {}
+        for year, text in rows:
+            by_year.setdefault(int(year), []).append(text)
+        return by_year or None
+
+    def add_bundle(self, bundle):
+        """Index every bundled day that is not indexed yet"""
+        for key in bundle.index["days"]:
+            month, day = (int(part) for part in key.split("-"))
+            if not self.has_day(month, day):
+                self.add_day(month, day, bundle.events_for_day(month, day))
+
+    def search(self, query, limit=20, min_year=None):
+        """Return up to `limit` (year, month, day, text) matches, best first"""
+        # Quote every word so user input is never parsed as FTS5 syntax
+        terms = " ".join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+        if not terms:
+            return []
+
+        sql = "SELECT year, month, day, text FROM events WHERE events MATCH ?"
+        params = [terms]
+        if min_year is not None:
+            sql += " AND year >= ?"
+            params.append(min_year)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,61 @@
+from tkinter import ttk
+
+
+class DecadeThemes:
+    """Per-decade color themes compiled once into ttk style options
+
+    Switching decades only reconfigures a handful of ttk styles and the
+    option database defaults used by newly created Tk widgets, so its cost
+    does not grow with the number of widgets on screen (unlike
+    `tk_setPalette`, which walks and recolors every widget). Must be called
+    from the main thread.
+    """
+
+    def __init__(self, root, decade_colors):
+        self.root = root
+        self.style = ttk.Style(root)
+        self.current = None
+        self.canvases = []
+        self.compiled = {name: self.compile(colors) for name, colors in decade_colors.items()}
+
+    def compile(self, colors):
+        bg, text, accent = colors["bg"], colors["text"], colors["accent"]
+        styles = {
+            "TFrame": {"background": bg},
+            "TLabel": {"background": bg, "foreground": text},
+            "TButton": {"background": accent, "foreground": "#FFFFFF"},
+            "TNotebook": {"background": bg},
+            "TNotebook.Tab": {"background": bg, "foreground": text},
+            "TSeparator": {"background": accent},
+        }
+        options = {
+            "*Background": bg,
+            "*Foreground": text,
+            "*activeBackground": accent,
+            "*activeForeground": "#FFFFFF",
+            "*highlightBackground": bg,
+        }
+        return {"bg": bg, "styles": styles, "options": options}
+
+    def add_canvas(self, canvas):
+        """Track a long-lived canvas whose background should follow the theme"""
+        self.canvases.append(canvas)
+        if self.current:
+            canvas.configure(background=self.compiled[self.current]["bg"])
+
+    def apply(self, name):
+        """Switch to the theme for `name` (e.g. "1960s"); a no-op if it is already active"""
+        theme = self.compiled.get(name)
+        if theme is None or name == self.current:
+            return False
+
+        for style_name, options in theme["styles"].items():
+            self.style.configure(style_name, **options)
+        for pattern, value in theme["options"].items():
+            self.root.option_add(pattern, value, "widgetDefault")
+        self.root.configure(background=theme["bg"])
+        for canvas in self.canvases:
+            canvas.configure(background=theme["bg"])
+
+        self.current = name
+        return True
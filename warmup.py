@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_VIEWS_PATH = os.path.join("cache", "views.json")
+DEFAULT_WARMED_PATH = os.path.join("cache", "warmed.json")
+
+# TMDB requests behind one uncached year lookup: discover plus credits for 5 movies
+YEAR_LOOKUP_REQUESTS = 6
+
+
+class ViewStats:
+    """Counts how often each year is viewed, persisted to a small JSON file"""
+
+    def __init__(self, path=DEFAULT_VIEWS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                self.years = {int(year): count for year, count in json.load(f).items()}
+        except Exception:
+            self.years = {}
+
+    def record(self, year):
+        # Written under the lock so overlapping time travels don't share the temp file
+        with self.lock:
+            self.years[year] = self.years.get(year, 0) + 1
+            try:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(self.years, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving view stats: {e}")
+
+    def top_years(self, count):
+        with self.lock:
+            return sorted(self.years, key=self.years.get, reverse=True)[:count]
+
+    def top_decades(self, count):
+        with self.lock:
+            totals = {}
+            for year, views in self.years.items():
+                totals[year // 10 * 10] = totals.get(year // 10 * 10, 0) + views
+        return sorted(totals, key=totals.get, reverse=True)[:count]
+
+
+class PosterWarmer:
+    """Background job that pre-fetches posters for the most viewed years and decades
+
+    Runs on a single daemon thread, steps aside while `busy` is set (a time
+    travel is loading), and stops once `budget_bytes` have been downloaded or
+    `max_requests` TMDB API requests made. Downloads are paced to stay under
+    `rate_bytes` per second. `fetch` is called with each Movie record and
+    returns the number of bytes it downloaded. Finished years are remembered
+    in `warmed_path` and skipped on later launches for `rewarm_after` seconds.
+    """
+
+    def __init__(self, builder, views, fetch, busy=None, budget_bytes=20 * 2**20,
+                 rate_bytes=256 * 2**10, top_years=5, top_decades=2, max_years=20,
+                 max_requests=30, warmed_path=DEFAULT_WARMED_PATH, rewarm_after=7 * 24 * 3600):
+        self.builder = builder
+        self.views = views
+        self.fetch = fetch
+        self.busy = busy or threading.Event()
+        self.budget_bytes = budget_bytes
+        self.rate_bytes = rate_bytes
+        self.top_years = top_years
+        self.top_decades = top_decades
+        self.max_years = max_years
+        self.max_requests = max_requests
+        self.warmed_path = warmed_path
+        self.rewarm_after = rewarm_after
+        self.downloaded = 0
+        self.requests = 0
+        self.thread = None
+        try:
+            with open(warmed_path, "r") as f:
+                self.warmed = {int(year): warmed_at for year, warmed_at in json.load(f).items()}
+        except Exception:
+            self.warmed = {}
+
+    def plan_years(self):
+        """Most viewed years first, then the other years of the most viewed decades"""
+        this_year = datetime.now().year
+        years = list(self.views.top_years(self.top_years))
+        for decade in self.views.top_decades(self.top_decades):
+            years.extend(range(max(decade, 1950), min(decade + 10, this_year + 1)))
+        return list(dict.fromkeys(years))[:self.max_years]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="poster-warmup", daemon=True)
+        self.thread.start()
+
+    def wait_until_idle(self):
+        """Let foreground time travel have the network first"""
+        while self.busy.is_set():
+            time.sleep(0.2)
+
+    def lookup_cost(self, year):
+        """TMDB requests get_year_movies will make for a year"""
+        bundle = self.builder.bundle
+        if not self.builder.tmdb_api_key or (bundle and bundle.movies_for_year(year)):
+            return 0
+        return YEAR_LOOKUP_REQUESTS
+
+    def mark_warmed(self, year):
+        self.warmed[year] = time.time()
+        try:
+            tmp_path = f"{self.warmed_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.warmed, f)
+            os.replace(tmp_path, self.warmed_path)
+        except OSError as e:
+            print(f"Error saving warmed years: {e}")
+
+    def run(self):
+        started = time.monotonic()
+        seen = set()
+        for year in self.plan_years():
+            if time.time() - self.warmed.get(year, 0) < self.rewarm_after:
+                continue
+            cost = self.lookup_cost(year)
+            if self.requests + cost > self.max_requests:
+                return
+            self.requests += cost
+
+            self.wait_until_idle()
+            movies = self.builder.get_year_movies(year) or []
+            for movie in movies:
+                url = movie.poster_url
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+
+                self.wait_until_idle()
+
+                try:
+                    self.downloaded += self.fetch(movie)
+                except Exception as e:
+                    print(f"Error warming poster: {e}")
+                if self.downloaded >= self.budget_bytes:
+                    return
+
+                # Stay under the bandwidth budget on average
+                ahead = self.downloaded / self.rate_bytes - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+            self.mark_warmed(year)